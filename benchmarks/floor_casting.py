@@ -0,0 +1,67 @@
+"""Floor/ceiling casting benchmark.
+
+Times FloorRenderer.draw() on an empty (fully transparent) frame, which is
+the worst case: every pixel below (and above) the horizon gets cast. Run from
+the repository root:
+
+    python -m benchmarks.floor_casting [--frames N] [--width W --height H]
+"""
+import argparse
+import math
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame as pg
+
+from engine import constants as con
+from engine.floor_renderer import FloorRenderer
+from engine.render_config import RenderConfig
+
+
+def bench(renderer: FloorRenderer, frame: pg.Surface, frames: int) -> float:
+    total = 0.0
+    for i in range(frames):
+        # Reset to "no walls" so every frame casts the full planes.
+        frame.fill(con.FRAME_COLOR_KEY)
+        angle = (i * 0.05) % math.tau
+        pos = (3.5 + math.sin(i * 0.1), 4.5 + math.cos(i * 0.1))
+        start = time.perf_counter()
+        renderer.draw(frame, pos, angle)
+        total += time.perf_counter() - start
+    return total / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--width', type=int, default=con.WIDTH)
+    parser.add_argument('--height', type=int, default=con.HEIGHT)
+    args = parser.parse_args()
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+    config = RenderConfig(args.width, args.height)
+    frame = pg.Surface(config.res).convert()
+    color_key = frame.map_rgb(con.FRAME_COLOR_KEY)
+    frame.set_colorkey(con.FRAME_COLOR_KEY)
+
+    floor = pg.image.load(os.path.join(con.WALL_TEXTURE_BASE, '1.png'))
+    ceiling = pg.image.load(os.path.join(con.WALL_TEXTURE_BASE, '2.png'))
+    renderer = FloorRenderer(config, color_key)
+
+    print(f'{config.width}x{config.height}, {config.num_rays} rays, '
+          f'{args.frames} frames, budget {con.FRAME_BUDGET_MS} ms')
+    for name, textures in (('floor', (floor, None)),
+                           ('floor + ceiling', (floor, ceiling))):
+        renderer.setup(frame, *textures)
+        ms = bench(renderer, frame, args.frames)
+        share = ms / con.FRAME_BUDGET_MS * 100
+        print(f'{name:>16}: {ms:6.2f} ms/frame ({share:.0f}% of budget)')
+
+    pg.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""Scripted camera flythrough benchmark.
+
+Loads a map headless, moves the player along a fixed path of positions and
+angles for a fixed number of frames, and reports frame time percentiles and
+the time spent in each stage of the frame as JSON. Enemies are spawned from
+a fixed seed and don't chase the player, and adaptive quality is off, so runs
+are comparable. Run from the repository root:
+
+    python main.py --bench data/maps/level1/level1.json
+    python -m benchmarks.flythrough MAP [--frames N] [--output FILE]
+"""
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import time
+from typing import Optional
+
+
+# (x, y, angle) keyframes, visited at constant speed. This one tours
+# level1; other maps can pass their own with --path.
+DEFAULT_PATH: list[tuple[float, float, float]] = [
+    (1.5, 5.5, math.pi / 2),
+    (2.5, 6.5, 0.0),
+    (10.5, 6.5, math.pi / 2),
+    (10.5, 12.5, math.pi / 2),
+    (8.5, 13.5, math.pi),
+    (2.5, 13.5, math.pi / 2),
+    (2.5, 18.5, 0.0),
+    (13.5, 18.5, math.pi / 2),
+    (13.5, 19.5, math.pi),
+    (4.5, 19.5, math.pi / 2),
+    (4.5, 25.5, 0.0),
+    (13.5, 25.5, math.pi / 2),
+    (13.5, 29.5, math.pi),
+    (1.5, 29.5, math.pi * 1.5),
+    (1.5, 24.5, math.pi * 1.75),
+]
+
+# Frame stages as marked by Game.step(), and what runs in
+# each of them.
+STAGES: dict[str, str] = {
+    'sync': 'SimulationThread.wait',
+    'input': 'Game.check_events',
+    'player': 'Player.update',
+    'ray_cast': 'RayCaster.update',
+    'objects': 'ObjectHandler.update',
+    'weapon': 'Weapon.update',
+    'hud': 'Hud.update',
+    'present': 'Game.present',
+    'render': 'ObjectRenderer.draw',
+    'weapon_draw': 'Weapon.draw',
+}
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    # Nearest rank.
+    if not ordered:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        'mean': round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        'p50': round(_percentile(ordered, 50), 3),
+        'p95': round(_percentile(ordered, 95), 3),
+        'p99': round(_percentile(ordered, 99), 3),
+        'max': round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def path_pose(path: list[tuple[float, float, float]],
+              t: float) -> tuple[float, float, float]:
+    """Pose at `t` (0..1) along the path, interpolating position linearly by
+    distance and the angle the short way round."""
+    if len(path) == 1:
+        return path[0]
+
+    lengths = [math.dist(a[:2], b[:2]) or 1e-6
+               for a, b in zip(path, path[1:])]
+    ends = list(itertools.accumulate(lengths))
+    distance = t * ends[-1]
+    segment = min(bisect.bisect_left(ends, distance), len(lengths) - 1)
+    (x0, y0, a0), (x1, y1, a1) = path[segment], path[segment + 1]
+    f = (distance - ends[segment] + lengths[segment]) / lengths[segment]
+    f = min(max(f, 0.0), 1.0)
+    turn = (a1 - a0 + math.pi) % math.tau - math.pi
+    return (x0 + (x1 - x0) * f, y0 + (y1 - y0) * f,
+            (a0 + turn * f) % math.tau)
+
+
+def run_bench(map_path: str, frames: int = 600,
+              output: Optional[str] = 'bench.json',
+              path: Optional[list[tuple[float, float, float]]] = None,
+              seed: int = 1) -> dict:
+    from game.doom_wolf import DoomWolf
+    from game.settings import GameSettings
+
+    path = path or DEFAULT_PATH
+    random.seed(seed)
+    dw = DoomWolf('DoomWolf benchmark', GameSettings(''), headless=True)
+    dw.quality.enabled = False
+    dw.load_test_map(os.path.abspath(map_path))
+    dw.new_game()
+    dw.running = True
+
+    timer = dw.stage_timer
+    frame_times: list[float] = []
+    stage_times: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    for i in range(frames):
+        x, y, angle = path_pose(path, i / max(frames - 1, 1))
+        dw.player.x, dw.player.y, dw.player.angle = x, y, angle
+        # Teleport rather than interpolate from the previous tick's pose.
+        dw.player.save_pose()
+        start = time.perf_counter()
+        dw.step()
+        frame_times.append((time.perf_counter() - start) * 1000)
+        for stage, samples in stage_times.items():
+            samples.append(timer.stages.get(stage, 0.0))
+
+    config = dw.render_config
+    report = {
+        'map': map_path,
+        'frames': frames,
+        'seed': seed,
+        'render_resolution': list(config.res),
+        'window_resolution': list(config.window_res),
+        'num_rays': config.num_rays,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'frame_ms': _summary(frame_times),
+        'stages': {
+            stage: dict(_summary(samples), name=STAGES[stage])
+            for stage, samples in stage_times.items()
+        },
+        'pathfinding': dw.path_finder.to_dict(),
+    }
+    if output:
+        with open(output, 'w', encoding='UTF-8') as file:
+            json.dump(report, file, indent=2)
+        print(f'Benchmark report written to {output}')
+    return report
+
+
+def print_report(report: dict):
+    frame = report['frame_ms']
+    print(f"{report['map']}: {report['frames']} frames at "
+          f"{report['render_resolution'][0]}x{report['render_resolution'][1]}")
+    print(f"  frame: mean {frame['mean']:.2f} ms, p50 {frame['p50']:.2f}, "
+          f"p95 {frame['p95']:.2f}, p99 {frame['p99']:.2f}")
+    for stage in report['stages'].values():
+        print(f"  {stage['name']:>22}: mean {stage['mean']:6.2f} ms, "
+              f"p95 {stage['p95']:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('map', help='Map JSON file to fly through.')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--output', default='bench.json')
+    parser.add_argument('--path', help='JSON list of [x, y, angle] '
+                                       'keyframes to use instead of the '
+                                       'built in path.')
+    args = parser.parse_args()
+
+    path = None
+    if args.path:
+        with open(args.path, encoding='UTF-8') as file:
+            path = [tuple(pose) for pose in json.load(file)]
+    print_report(run_bench(args.map, args.frames, args.output, path))
+
+
+if __name__ == '__main__':
+    main()
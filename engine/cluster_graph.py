@@ -0,0 +1,293 @@
+import heapq
+import math
+from typing import Optional
+
+from engine import constants as con
+from engine.tile_grid import TileGrid
+
+_WAYS = ((-1, 0), (0, -1), (1, 0), (0, 1),
+         (-1, -1), (1, -1), (1, 1), (-1, 1))
+_DIAGONAL_COST = math.sqrt(2)
+_STEPS = tuple((dx, dy, _DIAGONAL_COST if dx and dy else 1) for dx, dy in _WAYS)
+# Entrances at least this wide get a transition at each end rather than one
+# in the middle.
+_WIDE_ENTRANCE = 6
+# Stands in for the goal in the abstract search; not a tile.
+_GOAL = (-1, -1)
+
+
+def _octile(x0: int, y0: int, x1: int, y1: int) -> float:
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    return dx + dy + (_DIAGONAL_COST - 2) * min(dx, dy)
+
+
+class ClusterGraph:
+    """Hierarchical path finding (HPA*): A* over the transitions between
+    square clusters of tiles, with the paths inside each cluster kept."""
+
+    def __init__(self, grid: TileGrid, size: int = con.HPA_CLUSTER_SIZE):
+        self.grid: TileGrid = grid
+        self.size: int = size
+        self.cluster_cols: int = -(-grid.cols // size)
+        self.cluster_rows: int = -(-grid.rows // size)
+        # Transitions across the border of each pair of neighboring
+        # clusters, keyed by the pair with the top or left cluster first.
+        self.borders: dict[tuple[tuple[int, int], tuple[int, int]],
+                           list[tuple[tuple[int, int], tuple[int, int]]]] = {}
+        # Nodes on the other side of a border from each node.
+        self.links: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self.nodes: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        # Each built cluster's moves from each of its open tiles to the
+        # others: (next tile, cost).
+        self.moves: dict[tuple[int, int],
+                         dict[tuple[int, int],
+                              list[tuple[tuple[int, int], float]]]] = {}
+        # Within each cluster built so far, node -> other node -> (cost,
+        # path), where the path leads from the node (not included) to the
+        # other node.
+        self.intra: dict[tuple[int, int],
+                         dict[tuple[int, int],
+                              dict[tuple[int, int],
+                                   tuple[float, list[tuple[int, int]]]]]] = {}
+        self.cluster_builds: int = 0
+        self.searches: int = 0
+
+        for cy in range(self.cluster_rows):
+            for cx in range(self.cluster_cols):
+                if cx + 1 < self.cluster_cols:
+                    self.build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.cluster_rows:
+                    self.build_border((cx, cy), (cx, cy + 1))
+
+    def cluster_of(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.size, y // self.size
+
+    def bounds(self, cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        cx, cy = cluster
+        x0 = cx * self.size
+        y0 = cy * self.size
+        return (x0, y0, min(x0 + self.size, self.grid.cols),
+                min(y0 + self.size, self.grid.rows))
+
+    def can_step(self, x: int, y: int, dx: int, dy: int) -> bool:
+        is_blocked = self.grid.is_blocked
+        if is_blocked(x + dx, y + dy):
+            return False
+        return not dx or not dy or not (is_blocked(x + dx, y) or
+                                        is_blocked(x, y + dy))
+
+    def build_border(self, first: tuple[int, int], second: tuple[int, int]):
+        key = (first, second)
+        for a, b in self.borders.pop(key, ()):
+            self.links[a].remove(b)
+            self.links[b].remove(a)
+            for node in a, b:
+                if not self.links[node]:
+                    del self.links[node]
+                    self.nodes[self.cluster_of(*node)].discard(node)
+
+        x0, y0, x1, y1 = self.bounds(first)
+        if second[0] != first[0]:
+            # Side by side: the border is the first cluster's right column.
+            pairs = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:
+            pairs = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+
+        is_blocked = self.grid.is_blocked
+        transitions = []
+        run: list[tuple[tuple[int, int], tuple[int, int]]] = []
+        for pair in pairs + [None]:
+            if pair is not None and not (is_blocked(*pair[0]) or
+                                         is_blocked(*pair[1])):
+                run.append(pair)
+                continue
+            if len(run) >= _WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self.borders[key] = transitions
+        for a, b in transitions:
+            self.links.setdefault(a, []).append(b)
+            self.links.setdefault(b, []).append(a)
+            self.nodes.setdefault(first, set()).add(a)
+            self.nodes.setdefault(second, set()).add(b)
+
+    def nodes_in(self, cluster: tuple[int, int]) -> set[tuple[int, int]]:
+        return self.nodes.get(cluster, set())
+
+    def cluster_moves(self, cluster: tuple[int, int]) -> dict:
+        x0, y0, x1, y1 = self.bounds(cluster)
+        is_blocked = self.grid.is_blocked
+        # Tiles outside the cluster are left out, so moves never leave it.
+        open_tiles = {(x, y) for y in range(y0, y1) for x in range(x0, x1)
+                      if not is_blocked(x, y)}
+        return {
+            (x, y): [((x + dx, y + dy), step) for dx, dy, step in _STEPS
+                     if (x + dx, y + dy) in open_tiles and
+                     (not dx or not dy or ((x + dx, y) in open_tiles and
+                                           (x, y + dy) in open_tiles))]
+            for x, y in open_tiles
+        }
+
+    def search_cluster(self, origin: tuple[int, int],
+                       cluster: tuple[int, int],
+                       targets: Optional[set] = None) -> tuple[dict, dict]:
+        """Shortest paths from `origin` to every tile it can reach without
+        leaving `cluster`: (cost, came_from) by tile. With `targets`, only
+        the paths to those are sure to be complete."""
+        moves = self.moves.get(cluster)
+        if moves is None:
+            moves = self.moves[cluster] = self.cluster_moves(cluster)
+        cost = {origin: 0}
+        came_from = {origin: None}
+        open_set = [(0, origin)]
+        left = len(targets) if targets else -1
+        while open_set:
+            node_cost, node = heapq.heappop(open_set)
+            if node_cost > cost[node]:
+                continue
+            if targets and node in targets:
+                left -= 1
+                if not left:
+                    break
+
+            for next_node, step in moves.get(node, ()):
+                next_cost = node_cost + step
+                if next_cost < cost.get(next_node, math.inf):
+                    cost[next_node] = next_cost
+                    came_from[next_node] = node
+                    heapq.heappush(open_set, (next_cost, next_node))
+        return cost, came_from
+
+    @staticmethod
+    def trace(came_from: dict, node: tuple[int, int]) -> list[tuple[int, int]]:
+        """The path to `node`, without the tile it was searched from."""
+        path = []
+        while came_from[node] is not None:
+            path.append(node)
+            node = came_from[node]
+        path.reverse()
+        return path
+
+    def edges_in(self, cluster: tuple[int, int]) -> dict:
+        edges = self.intra.get(cluster)
+        if edges is None:
+            edges = self.build_cluster(cluster)
+        return edges
+
+    def build_cluster(self, cluster: tuple[int, int]) -> dict:
+        nodes = self.nodes_in(cluster)
+        edges = {}
+        for node in nodes:
+            cost, came_from = self.search_cluster(node, cluster, nodes)
+            edges[node] = {
+                other: (cost[other], self.trace(came_from, other))
+                for other in nodes if other != node and other in cost
+            }
+        self.intra[cluster] = edges
+        self.cluster_builds += 1
+        return edges
+
+    def on_blocked_changed(self, x: int, y: int):
+        """Redoes what a tile starting or stopping blocking can change: the
+        borders of its cluster and the clusters sharing them."""
+        cx, cy = self.cluster_of(x, y)
+        clusters = [(cx, cy)]
+        for nx, ny in (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1):
+            if 0 <= nx < self.cluster_cols and 0 <= ny < self.cluster_rows:
+                clusters.append((nx, ny))
+                self.build_border(min((cx, cy), (nx, ny)),
+                                  max((cx, cy), (nx, ny)))
+        self.moves.pop((cx, cy), None)
+        for cluster in clusters:
+            self.intra.pop(cluster, None)
+
+    def find_path(self, start: tuple[int, int],
+                  goal: tuple[int, int]) -> Optional[list[tuple[int, int]]]:
+        """A path from `start` to `goal`, last step first and without
+        `start`, or None if there isn't one."""
+        grid = self.grid
+        if (not grid.in_bounds(*start) or not grid.in_bounds(*goal) or
+                grid.is_blocked(*goal)):
+            return None
+        if start == goal:
+            return []
+
+        self.searches += 1
+        start_cluster = self.cluster_of(*start)
+        goal_cluster = self.cluster_of(*goal)
+        start_cost, start_from = self.search_cluster(start, start_cluster)
+        if start_cluster == goal_cluster and goal in start_cost:
+            return self.trace(start_from, goal)[::-1]
+
+        # Costs from the goal's cluster's nodes to the goal. Moves go both
+        # ways, so this is a search out from the goal.
+        goal_cost, goal_from = self.search_cluster(goal, goal_cluster)
+        goal_nodes = {node: goal_cost[node]
+                      for node in self.nodes_in(goal_cluster)
+                      if node in goal_cost}
+        if not goal_nodes:
+            return None
+
+        gx, gy = goal
+        cost = {}
+        came_from = {}
+        open_set = []
+        for node in self.nodes_in(start_cluster):
+            if node in start_cost:
+                cost[node] = start_cost[node]
+                came_from[node] = None
+                heapq.heappush(open_set, (cost[node] + _octile(*node, gx, gy),
+                                          cost[node], node))
+
+        last = None
+        while open_set:
+            _, node_cost, node = heapq.heappop(open_set)
+            if node == _GOAL:
+                break
+            if node_cost > cost[node]:
+                continue
+
+            neighbors = [(other, 1) for other in self.links.get(node, ())]
+            neighbors += [
+                (other, edge[0]) for other, edge in
+                self.edges_in(self.cluster_of(*node)).get(node, {}).items()
+            ]
+            for other, step in neighbors:
+                next_cost = node_cost + step
+                if next_cost < cost.get(other, math.inf):
+                    cost[other] = next_cost
+                    came_from[other] = node
+                    heapq.heappush(open_set,
+                                   (next_cost + _octile(*other, gx, gy),
+                                    next_cost, other))
+            if node in goal_nodes:
+                total = node_cost + goal_nodes[node]
+                if total < cost.get(_GOAL, math.inf):
+                    cost[_GOAL] = total
+                    last = node
+                    heapq.heappush(open_set, (total, total, _GOAL))
+        else:
+            return None
+
+        # Refine: string the kept paths between the nodes together.
+        nodes = [last]
+        while came_from[nodes[-1]] is not None:
+            nodes.append(came_from[nodes[-1]])
+        nodes.reverse()
+
+        path = self.trace(start_from, nodes[0])
+        for node, next_node in zip(nodes, nodes[1:]):
+            if self.cluster_of(*node) != self.cluster_of(*next_node):
+                path.append(next_node)
+            else:
+                path += self.intra[self.cluster_of(*node)][node][next_node][1]
+        # The goal search leads from the goal to the last node, so it's
+        # followed backwards.
+        if last != goal:
+            path += self.trace(goal_from, last)[::-1][1:] + [goal]
+        path.reverse()
+        return path
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import pygame as pg
+from typing import Optional
+
+
+class ColumnCache:
+    """Bounded, size-aware LRU cache of scaled wall column surfaces.
+
+    Keys are (texture id, texture x-offset, quantized projection height).
+    The cache tracks the pixel memory held by its surfaces and evicts the
+    least recently used columns once `max_bytes` is exceeded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes: int = max_bytes
+        self.size_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._columns: OrderedDict[tuple[int, int, int], pg.Surface] = \
+            OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def surface_bytes(surface: pg.Surface) -> int:
+        return surface.get_width() * surface.get_height() * \
+            surface.get_bytesize()
+
+    def get(self, key: tuple[int, int, int]) -> Optional[pg.Surface]:
+        column = self._columns.get(key)
+        if column is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._columns.move_to_end(key)
+        return column
+
+    def put(self, key: tuple[int, int, int], column: pg.Surface):
+        size = self.surface_bytes(column)
+        if size > self.max_bytes:
+            return
+
+        old = self._columns.pop(key, None)
+        if old is not None:
+            self.size_bytes -= self.surface_bytes(old)
+
+        self._columns[key] = column
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._columns.popitem(last=False)
+            self.size_bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._columns.clear()
+        self.size_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
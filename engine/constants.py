@@ -35,6 +35,25 @@ HALF_BLOCK = GRID_BLOCK / 2
 FIFTH_BLOCK = GRID_BLOCK / 5
 FPS = 0
 SHOW_FPS = True
+# Per-stage frame timing graph, toggled in game with F3.
+SHOW_STAGE_OVERLAY = False
+STAGE_OVERLAY_FRAMES = 120
+# Frame time statistics: the last FRAME_STATS_SIZE frame times are kept for
+# percentiles and a histogram. F4 saves them to FRAME_STATS_PATH (.json or
+# .csv), as does quitting when SAVE_FRAME_STATS_ON_QUIT is set.
+FRAME_STATS_SIZE = 3600
+FRAME_STATS_PATH = 'frame_stats.json'
+SAVE_FRAME_STATS_ON_QUIT = False
+# Fixed timestep: the player, enemies, items and weapon are updated
+# TICK_RATE times a second whatever the frame rate, and frames interpolate
+# positions between the last two ticks. At most MAX_TICKS_PER_FRAME ticks are
+# run to catch up after a slow frame; the rest of the time is dropped.
+FIXED_TIMESTEP = True
+TICK_RATE = 35
+MAX_TICKS_PER_FRAME = 5
+# Pipelined simulation (needs FIXED_TIMESTEP): ticks run on a worker thread
+# while the main thread draws the previous tick's snapshot of the world.
+PIPELINED_SIMULATION = False
 
 PLAYER_POS = 1.5, 5  # mini_map
 PLAYER_ANGLE = 0
@@ -60,13 +79,64 @@ HALF_NUM_RAYS = NUM_RAYS // 2
 DELTA_ANGLE = FOV / NUM_RAYS
 MAX_DEPTH = 20
 DOUBLE_PI = math.pi * 2
+USE_NUMPY_RAYCASTER = True
+USE_FRAMEBUFFER_RENDERER = True
+# Reuse the previous frame's rays when the player hasn't moved, and only cast
+# newly exposed columns when the player has only turned.
+TEMPORAL_COHERENCE = True
+# Worker threads used to cast rays and rasterize walls in vertical strips.
+# 1 keeps everything on the main thread.
+RENDER_WORKERS = 1
+FRAME_COLOR_KEY = (255, 0, 255)
+# Adaptive quality: detail is lowered one step at a time while the median
+# frame time of the last QUALITY_WINDOW frames exceeds FRAME_BUDGET_MS, and
+# raised again once it drops below FRAME_BUDGET_MS * QUALITY_HEADROOM.
+ADAPTIVE_QUALITY = True
+FRAME_BUDGET_MS = 16.6
+QUALITY_WINDOW = 30
+QUALITY_HEADROOM = 0.75
+# Potentially visible set: the tiles that can be seen from each tile, worked
+# out exactly when a map is loaded. Sprites and enemies on tiles that can't be
+# seen from the player's tile aren't drawn. The set takes a bit per pair of
+# tiles and its build time grows with the square of the open area (about 2.5 s
+# for an empty 48x48 map), so maps over PVS_MAX_TILES tiles don't get one.
+USE_PVS = True
+PVS_MAX_TILES = 48 * 48
+# How enemies find their way to the player:
+# 'flow'  - a breadth first search from the player's tile, redone only when
+#           the player changes tile, gives every tile its distance in steps;
+#           enemies step to the nearest neighbor, preferring a free one.
+# 'astar' - A* per enemy (diagonals cost sqrt(2), no cutting wall corners),
+#           keeping the path until the goal changes or the next step is
+#           blocked.
+# 'hpa'   - like 'astar', but over a hierarchy of HPA_CLUSTER_SIZE tile square
+#           clusters (HPA*), for maps hundreds of tiles across.
+# 'bfs'   - a breadth first search from each enemy every time.
+# Closed doors and other obstacles block like walls; only the tiles around
+# them are patched when they come and go. Maps can choose a mode with a
+# "pathfinding" key, and those that don't use 'hpa' from HPA_AUTO_TILES tiles.
+# Keep that above PVS_MAX_TILES: maps that size load without a PVS.
+PATHFINDING = 'flow'
+HPA_CLUSTER_SIZE = 16
+HPA_AUTO_TILES = 128 * 128
+# Enemies queue their path requests, which are worked through each tick until
+# PATH_BUDGET_MS is used up. The rest wait for the next tick while their
+# enemies keep heading for the last step they were given.
+PATH_BUDGET_MS = 1.0
 
 SCREEN_DIST = HALF_WIDTH // math.tan(HALF_FOV)
 SCALE = WIDTH // NUM_RAYS
+# Depth resolution (steps per tile) of the projection height lookup table.
+PROJ_DEPTH_STEPS = 4096
 
 TEXTURE_SIZE = 256
 HALF_TEXTURE_SIZE = TEXTURE_SIZE // 2
 
+# Scaled wall columns are cached by projected height rounded down to a
+# multiple of this many pixels.
+COLUMN_HEIGHT_STEP = 2
+COLUMN_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
 AUDIO_ITEM_CHANNEL = 2
 AUDIO_BODY_CHANNEL = 3
 AUDIO_FADE_OUT = 1000
@@ -0,0 +1,56 @@
+from engine import ray_kernel
+
+np = ray_kernel.np
+
+
+class DepthBuffer:
+    """Per-column wall depths of the current frame.
+
+    The ray caster fills this with the (fishbowl corrected) depth of the
+    wall in every ray column. Walls can then be drawn in any order, and each
+    sprite is clipped column by column against it, so sprites only need to
+    be sorted among themselves.
+    """
+
+    def __init__(self, width: int, scale: int):
+        self.width: int = width
+        self.scale: int = scale
+        self.depths = None
+
+    def set(self, depths):
+        self.depths = depths
+
+    def visible_runs(self, depth: float, left: int,
+                     right: int) -> list[tuple[int, int]]:
+        """Screen column ranges [start, end) of the span [left, right) where
+        something at `depth` is in front of the walls."""
+        first = max(left, 0)
+        last = min(right, self.width)
+        if first >= last or self.depths is None:
+            return []
+
+        scale = self.scale
+        first_ray = first // scale
+        last_ray = min((last - 1) // scale + 1, len(self.depths))
+        walls = self.depths[first_ray:last_ray]
+        if np is not None and isinstance(walls, np.ndarray):
+            visible = walls > depth
+            if visible.all():
+                return [(first, last)]
+            if not visible.any():
+                return []
+            edges = (np.flatnonzero(np.diff(visible.view(np.int8))) + 1)\
+                .tolist()
+            visible = visible.tolist()
+        else:
+            visible = [wall > depth for wall in walls]
+            edges = [i for i in range(1, len(visible))
+                     if visible[i] != visible[i - 1]]
+
+        runs = []
+        bounds = [0] + edges + [len(visible)]
+        for start, end in zip(bounds, bounds[1:]):
+            if visible[start]:
+                runs.append((max((first_ray + start) * scale, first),
+                             min((first_ray + end) * scale, last)))
+        return runs
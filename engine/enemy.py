@@ -3,6 +3,7 @@ import math
 import os
 import pygame as pg
 from random import randint, random
+from typing import Optional
 
 from engine import constants as con
 from engine.sprite import AnimatedSprite
@@ -34,6 +35,12 @@ class Enemy(AnimatedSprite):
         self.alive: bool = True
         self.pain: bool = False
         self.ray_cast_value: bool = False
+        # Line of sight and path finding are refreshed every few ticks (see
+        # QualityLevel.ai_interval). Enemies start at random phases so they
+        # don't all think on the same tick.
+        self.ai_countdown: int = randint(0, 2)
+        self.ai_tick: bool = True
+        self.next_pos: Optional[tuple[int, int]] = None
         self.frame_counter: int = 0
         self.player_search_trigger: bool = False
         self.spawn_weight: int = 0
@@ -56,8 +63,7 @@ class Enemy(AnimatedSprite):
         self.see_images = self.load_images(os.path.join(self.path, "see"))
 
     def check_wall(self, x: int, y: int) -> bool:
-        return ((x, y) not in self.game.map.world_map and
-                not self.game.map.has_obstacle((x, y)))
+        return not self.game.map.grid.is_blocked(x, y)
 
     def check_wall_collision(self, dx: float, dy: float):
         if self.check_wall(int(self.x + dx * self.size), int(self.y)):
@@ -75,10 +81,14 @@ class Enemy(AnimatedSprite):
     def movement(self):
         # TODO check collision with player and/or vice-versa. Currently, the player can literally walk through
         # enemies. We need to prevent this.
-        get_path = self.game.path_finder.get_path
-        my_pos = self.map_pos
-        player_pos = self.game.player.map_pos
-        next_pos = get_path(my_pos, player_pos)
+        path_finder = self.game.path_finder
+        if self.ai_tick or self.next_pos is None:
+            path_finder.request(self.map_pos, self.game.player.map_pos, self)
+        # Keep heading for the last step until the request is answered.
+        next_pos = self.next_pos = path_finder.results.pop(self,
+                                                           self.next_pos)
+        if next_pos is None:
+            return
         next_x, next_y = next_pos
 
         if con.DEBUG:
@@ -122,8 +132,12 @@ class Enemy(AnimatedSprite):
 
     def check_damage(self):
         if self.ray_cast_value and self.game.player.shot:
-            w1 = con.HALF_WIDTH - self.sprite_half_width
-            w2 = con.HALF_WIDTH + self.sprite_half_width
+            half_width = self.game.render_config.half_width
+            # Worked out here rather than taken from the last projection,
+            # which is only done for frames.
+            sprite_half_width = self.projection_size(self.norm_dist)[0] // 2
+            w1 = half_width - sprite_half_width
+            w2 = half_width + sprite_half_width
             if w1 < self.screen_x < w2:
                 self.play_action_sound('pain')
                 self.game.player.shot = False
@@ -142,11 +156,16 @@ class Enemy(AnimatedSprite):
 
         ox, oy = self.game.player.pos
         x_map, y_map = self.game.player.map_pos
+        is_blocked = self.game.map.grid.is_blocked
+        my_pos = self.map_pos
 
-        ray_angle = self.theta
-
-        sin_a = math.sin(ray_angle)
-        cos_a = math.cos(ray_angle)
+        # The ray points from the player at this enemy, so its direction is
+        # already known from refresh_sprite(). Axis-aligned rays are nudged
+        # off zero like atan2/sin/cos would.
+        if not self.dist:
+            return True
+        sin_a = self.dy / self.dist or 1e-12
+        cos_a = self.dx / self.dist or 1e-12
 
         # Horizontals
         y_hor, dy = (y_map + 1, 1) if sin_a > 0 else (y_map - 1e-6, -1)
@@ -159,13 +178,10 @@ class Enemy(AnimatedSprite):
 
         for _ in range(con.MAX_DEPTH):
             tile_hor = int(x_hor), int(y_hor)
-            if tile_hor == self.map_pos:
+            if tile_hor == my_pos:
                 player_dist_h = depth_hor
                 break
-            if tile_hor in self.game.map.world_map:
-                wall_dist_h = depth_hor
-                break
-            if tile_hor in self.game.map.obstacles:
+            if is_blocked(*tile_hor):
                 # Treat obstacles the same as walls
                 wall_dist_h = depth_hor
                 break
@@ -185,13 +201,10 @@ class Enemy(AnimatedSprite):
 
         for _ in range(con.MAX_DEPTH):
             tile_vert = int(x_vert), int(y_vert)
-            if tile_vert == self.map_pos:
+            if tile_vert == my_pos:
                 player_dist_v = depth_vert
                 break
-            if tile_vert in self.game.map.world_map:
-                wall_dist_v = depth_vert
-                break
-            if tile_vert in self.game.map.obstacles:
+            if is_blocked(*tile_vert):
                 # Treat obstacles the same as walls
                 wall_dist_v = depth_vert
                 break
@@ -215,9 +228,17 @@ class Enemy(AnimatedSprite):
             player_center = (100 * p.x, 100 * p.y)
             pg.draw.line(self.game.screen, 'orange', player_center, center, 2)
 
+    def check_ai_tick(self):
+        self.ai_countdown -= 1
+        self.ai_tick = self.ai_countdown <= 0
+        if self.ai_tick:
+            self.ai_countdown = self.game.quality.level.ai_interval
+
     def think(self):
         if self.alive:
-            self.ray_cast_value = self.ray_cast_enemy()
+            self.check_ai_tick()
+            if self.ai_tick:
+                self.ray_cast_value = self.ray_cast_enemy()
             self.check_damage()
 
             if self.pain:
@@ -0,0 +1,124 @@
+import pygame as pg
+from typing import Optional
+
+from engine import constants as con
+from engine import ray_kernel
+from engine.render_config import RenderConfig
+
+np = ray_kernel.np
+
+
+class FloorRenderer:
+    """Casts textured floors and ceilings into the wall frame buffer.
+
+    A floor pixel `r` rows below the horizon lies at the perpendicular
+    distance screen_dist / (2 * r), the same projection the walls use, so
+    its world position is the player position plus that distance times the
+    column's ray direction divided by its fishbowl factor. Texture
+    coordinates for every (row, ray) pair are computed as one outer product
+    per axis. The ceiling row the same distance above the horizon maps to the
+    same texel coordinates, so it costs one extra gather.
+
+    Pixels are only written where the walls left the frame transparent, and
+    rows nearer the horizon than the bottom of the shortest wall are skipped
+    altogether since no floor can show there.
+    """
+
+    def __init__(self, config: RenderConfig, color_key: int):
+        self.config: RenderConfig = config
+        self.color_key: int = color_key
+        self.floor = None
+        self.ceiling = None
+        rows = config.height - config.half_height
+        row_dist = config.screen_dist / (2 * (np.arange(rows) + 0.5))
+        # Rows right at the horizon are behind any wall in an enclosed map;
+        # clamping keeps their coordinates finite.
+        row_dist = np.minimum(row_dist, con.MAX_DEPTH * 2)
+        self.row_dist = (row_dist * con.TEXTURE_SIZE).astype(np.float32)
+        shape = (rows, config.num_rays)
+        self._u = np.empty(shape, dtype=np.float32)
+        self._v = np.empty(shape, dtype=np.float32)
+        self._ui = np.empty(shape, dtype=np.int32)
+        self._vi = np.empty(shape, dtype=np.int32)
+
+    @property
+    def active(self) -> bool:
+        return self.floor is not None or self.ceiling is not None
+
+    def _texels(self, texture: Optional[pg.Surface], frame: pg.Surface):
+        if texture is None:
+            return None
+
+        size = con.TEXTURE_SIZE
+        if texture.get_size() != (size, size):
+            texture = pg.transform.scale(texture, (size, size))
+        texels = pg.surfarray.array2d(texture.convert(frame)).T
+        texels = texels.astype(np.uint32).ravel()
+        # Keep opaque texels from colliding with the color key.
+        texels[texels == self.color_key] ^= 1
+        return texels
+
+    def setup(self, frame: pg.Surface, floor: Optional[pg.Surface],
+              ceiling: Optional[pg.Surface] = None):
+        self.floor = self._texels(floor, frame)
+        self.ceiling = self._texels(ceiling, frame)
+
+    def texel_index(self, pos: tuple[float, float], view_angle: float,
+                    first_row: int = 0):
+        """Index into a flattened texture for each (row, ray) below the
+        horizon, starting `first_row` rows below it."""
+        size = con.TEXTURE_SIZE
+        arrays = self.config.tables.arrays
+        sin_a, cos_a = arrays.ray_directions(view_angle)
+        dir_x = (cos_a / arrays.fishbowl).astype(np.float32)
+        dir_y = (sin_a / arrays.fishbowl).astype(np.float32)
+
+        u, v = self._u[first_row:], self._v[first_row:]
+        ui, vi = self._ui[first_row:], self._vi[first_row:]
+        row_dist = self.row_dist[first_row:]
+        np.multiply.outer(row_dist, dir_x, out=u)
+        u += np.float32(pos[0] * size)
+        np.multiply.outer(row_dist, dir_y, out=v)
+        v += np.float32(pos[1] * size)
+        ui[...] = u
+        vi[...] = v
+        ui &= size - 1
+        vi &= size - 1
+        vi *= size
+        vi += ui
+        return vi
+
+    def draw(self, frame: pg.Surface, pos: tuple[float, float],
+             view_angle: float, proj_heights=None):
+        if not self.active:
+            return
+
+        config = self.config
+        first_row = 0
+        if proj_heights is not None:
+            first_row = min(max(int(proj_heights.min()) // 2 - 1, 0),
+                            len(self.row_dist))
+        index = self.texel_index(pos, view_angle, first_row)
+        width = config.num_rays * config.scale
+        pixels = pg.surfarray.pixels2d(frame).T
+        planes = []
+        if self.floor is not None:
+            floor = pixels[config.half_height + first_row:, :width]
+            planes.append((floor, self.floor))
+        if self.ceiling is not None:
+            # Mirrored, so ceiling rows line up with the floor rows at the
+            # same distance from the horizon.
+            ceiling_row = config.half_height - 1 - first_row
+            if ceiling_row >= 0:
+                ceiling = pixels[ceiling_row::-1, :width]
+                planes.append((ceiling, self.ceiling))
+
+        for target, texels in planes:
+            colors = np.take(texels, index[:len(target)])
+            # Walls cover all the pixel columns of a ray alike, so the first
+            # one tells which pixels are still transparent.
+            visible = target[:, ::config.scale] == self.color_key
+            for sub_column in range(config.scale):
+                np.copyto(target[:, sub_column::config.scale], colors,
+                          where=visible)
+        del pixels
@@ -0,0 +1,130 @@
+import csv
+import json
+import math
+from collections import deque
+
+from engine import constants as con
+
+
+class Hitch:
+    """A frame that took more than twice the frame budget."""
+
+    def __init__(self, frame: int, frame_ms: float, stage: str,
+                 stage_ms: float):
+        self.frame: int = frame
+        self.frame_ms: float = frame_ms
+        self.stage: str = stage
+        self.stage_ms: float = stage_ms
+
+    def to_dict(self) -> dict:
+        return {
+            'frame': self.frame,
+            'frame_ms': round(self.frame_ms, 3),
+            'stage': self.stage,
+            'stage_ms': round(self.stage_ms, 3)
+        }
+
+
+class FrameStats:
+    """Frame time distribution over the last `size` frames.
+
+    Frame times go into a fixed size ring buffer, from which percentiles and
+    a histogram are worked out on demand, so recording a frame is just an
+    append. Frames over twice the budget are counted as hitches (over the
+    whole run, not just the buffer), each with the stage that took the
+    longest, and the most recent ones are kept. Everything can be written
+    out as JSON, or as CSV with one row per buffered frame.
+    """
+
+    MAX_HITCHES = 100
+
+    def __init__(self, size: int = con.FRAME_STATS_SIZE,
+                 budget_ms: float = con.FRAME_BUDGET_MS):
+        self.budget_ms: float = budget_ms
+        self.frame_times: deque[float] = deque(maxlen=size)
+        self.frames: int = 0
+        self.hitch_count: int = 0
+        self.hitch_stages: dict[str, int] = {}
+        self.hitches: deque[Hitch] = deque(maxlen=self.MAX_HITCHES)
+
+    @property
+    def hitch_ms(self) -> float:
+        return self.budget_ms * 2
+
+    def clear(self):
+        self.frame_times.clear()
+        self.frames = 0
+        self.hitch_count = 0
+        self.hitch_stages.clear()
+        self.hitches.clear()
+
+    def record(self, frame_ms: float, stages: dict[str, float]):
+        self.frame_times.append(frame_ms)
+        self.frames += 1
+        if frame_ms > self.hitch_ms and stages:
+            stage = max(stages, key=stages.get)
+            self.hitch_count += 1
+            self.hitch_stages[stage] = self.hitch_stages.get(stage, 0) + 1
+            self.hitches.append(Hitch(self.frames, frame_ms, stage,
+                                      stages[stage]))
+
+    def percentiles(self, *percents: float) -> dict[float, float]:
+        """Nearest rank percentiles of the buffered frame times."""
+        ordered = sorted(self.frame_times)
+        result = {}
+        for percent in percents or (50, 90, 95, 99):
+            if not ordered:
+                result[percent] = 0.0
+                continue
+            rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+            result[percent] = ordered[rank - 1]
+        return result
+
+    def histogram(self, bucket_ms: float = 1.0) -> list[tuple[float, int]]:
+        """(bucket start ms, frame count) for every bucket up to the slowest
+        buffered frame."""
+        if not self.frame_times:
+            return []
+
+        counts = [0] * (int(max(self.frame_times) // bucket_ms) + 1)
+        for frame_ms in self.frame_times:
+            counts[int(frame_ms // bucket_ms)] += 1
+        return [(i * bucket_ms, count) for i, count in enumerate(counts)]
+
+    def to_dict(self) -> dict:
+        times = self.frame_times
+        mean = sum(times) / len(times) if times else 0.0
+        return {
+            'frames': self.frames,
+            'buffered': len(times),
+            'budget_ms': self.budget_ms,
+            'mean_ms': round(mean, 3),
+            'max_ms': round(max(times, default=0.0), 3),
+            'percentiles_ms': {
+                f'p{percent:g}': round(ms, 3)
+                for percent, ms in self.percentiles().items()
+            },
+            'histogram': [
+                {'from_ms': start, 'frames': count}
+                for start, count in self.histogram()
+            ],
+            'hitches': {
+                'threshold_ms': self.hitch_ms,
+                'count': self.hitch_count,
+                'by_stage': dict(self.hitch_stages),
+                'recent': [hitch.to_dict() for hitch in self.hitches]
+            }
+        }
+
+    def save(self, path: str):
+        """Writes CSV if `path` ends in .csv, JSON otherwise."""
+        with open(path, 'w', encoding='UTF-8', newline='') as file:
+            if path.lower().endswith('.csv'):
+                first = self.frames - len(self.frame_times) + 1
+                writer = csv.writer(file)
+                writer.writerow(['frame', 'frame_ms'])
+                for i, frame_ms in enumerate(self.frame_times):
+                    writer.writerow([first + i, round(frame_ms, 3)])
+            else:
+                json.dump(self.to_dict(), file, indent=2)
+        print(f'Frame stats saved to {path}')
@@ -2,10 +2,12 @@ import os
 import sys
 
 import pygame as pg
-from typing import Optional
+from typing import Callable, Optional
 
 from engine import constants as con
+from engine import ray_kernel
 from engine import RGBColors
+from engine.frame_stats import FrameStats
 from engine.hud import Hud
 from engine.input_handler import InputEvent
 from engine.input_handler import InputHandler
@@ -14,21 +16,61 @@ from engine.object_handler import ObjectHandler
 from engine.object_renderer import ObjectRenderer
 from engine.path_finder import PathFinder
 from engine.player import Player
+from engine.quality_governor import QualityGovernor
 from engine.raycaster import RayCaster
+from engine.render_config import RenderConfig
+from engine.simulation_thread import SimulationThread
 from engine.sound import Sound
+from engine.stage_overlay import StageOverlay
+from engine.stage_timer import StageTimer
+from engine.strip_pool import StripPool
 from engine.text import Text
 from engine.weapon import Weapon
+from engine.world_snapshot import WorldSnapshot
 
 
 class Game:
+    """The game loop and everything it drives. `headless` renders off-screen
+    with SDL's dummy drivers; `keep_frames` keeps frames for `frame_array()`."""
 
-    def __init__(self):
+    def __init__(self, headless: bool = False):
+        self.headless: bool = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
         pg.init()
         self.input: InputHandler = InputHandler(self)
-        self.screen: pg.Surface = pg.display.set_mode(con.RES, pg.HWSURFACE)
+        self.render_config: RenderConfig = RenderConfig()
+        self.window: pg.Surface = pg.display.set_mode(con.RES, pg.HWSURFACE)
+        # The world is drawn to `screen`, which is the window itself unless
+        # the internal render resolution differs from the window's.
+        self.screen: pg.Surface = self.window
         self.window_title: str = ''
         self.clock: pg.time.Clock = pg.time.Clock()
-        self.delta_time: int = 1
+        self.strip_pool: Optional[StripPool] = None
+        if con.RENDER_WORKERS > 1:
+            self.strip_pool = StripPool(con.RENDER_WORKERS)
+        # Milliseconds since the previous frame, and simulated per update
+        # (the tick length with a fixed timestep).
+        self.frame_time: int = 1
+        self.delta_time: float = 1
+        # Fixed timestep state: milliseconds not yet simulated and how far
+        # the frame is into the next tick (0..1). Frames are drawn from
+        # `world`, which is captured between ticks.
+        self.fixed_timestep: bool = con.FIXED_TIMESTEP
+        self.tick_ms: float = 1000 / con.TICK_RATE
+        self.tick_accumulator: float = 0
+        self.tick_alpha: float = 1.0
+        self.world: WorldSnapshot = WorldSnapshot()
+        self.simulation: Optional[SimulationThread] = None
+        if self.fixed_timestep:
+            self.delta_time = self.tick_ms
+            if con.PIPELINED_SIMULATION:
+                self.simulation = SimulationThread(self)
+        self.stage_timer: StageTimer = StageTimer()
+        self.stage_overlay: StageOverlay = StageOverlay(self)
+        self.frame_stats: FrameStats = FrameStats()
+        self.quality: QualityGovernor = QualityGovernor()
         self.global_trigger: bool = False
         self.paused: bool = False
         self.global_event: int = pg.USEREVENT + 0
@@ -45,6 +87,12 @@ class Game:
         self.running: bool = False
         self.fps_text: Optional[Text] = None
         self.test_mode: bool = False
+        self.frame_count: int = 0
+        # The world for the next frame is drawn into the display surface
+        # right after the previous one is presented, so a copy is kept for
+        # frame_array() when this is set.
+        self.keep_frames: bool = False
+        self.presented_frame: Optional[pg.Surface] = None
 
     def new_game(self, skip_default_map_load: bool = False):
         if not skip_default_map_load:
@@ -66,22 +114,122 @@ class Game:
 
         self.current_weapon = Weapon(self, '')
 
+        if self.path_finder:
+            self.path_finder.detach()
         self.path_finder = PathFinder(self)
         self.sound.play_music()
+        self._create_fps_text()
+
+    def _create_fps_text(self):
         if con.SHOW_FPS:
+            size = int(35 * self.render_config.ui_scale)
             self.fps_text = Text(self, (0, 0), "FPS: ",
-                                 RGBColors.RED, "DUGAFONT.ttf", 35)
+                                 RGBColors.RED, "DUGAFONT.ttf", size)
+
+    def set_render_config(self, config: RenderConfig):
+        """Switches the window and/or internal render resolution.
+
+        Anything that was laid out for the previous resolution is rebuilt.
+        """
+        if config == self.render_config:
+            return
+
+        if (config.res == self.render_config.res and
+                config.window_res == self.render_config.window_res):
+            # Only the ray count changed; textures and HUD can be kept.
+            self.render_config = config
+            if self.ray_caster is not None:
+                self.object_renderer.setup_wall_renderer()
+                self.ray_caster = RayCaster(self)
+            return
+
+        if config.window_res != self.window.get_size():
+            self.window = pg.display.set_mode(config.window_res,
+                                              pg.HWSURFACE)
+
+        self.render_config = config
+        if config.is_scaled:
+            self.screen = pg.Surface(config.res).convert()
+        else:
+            self.screen = self.window
+        self.object_renderer.screen = self.screen
+        self.hud = Hud(self)
+        self.stage_overlay.reset()
+        if self.ray_caster is not None:
+            self.object_renderer.setup()
+            self.ray_caster = RayCaster(self)
+            self._create_fps_text()
+
+    def apply_quality(self):
+        level = self.quality.level
+        print(f'Quality level {self.quality.index}: {level}')
+        config = self.render_config.with_column_width(level.column_width)
+        self.set_render_config(config)
+
+    def present(self):
+        if self.screen is not self.window:
+            pg.transform.scale(self.screen, self.window.get_size(),
+                               self.window)
+        pg.display.flip()
+        if self.keep_frames:
+            if (self.presented_frame is None or
+                    self.presented_frame.get_size() != self.window.get_size()):
+                self.presented_frame = self.window.copy()
+            else:
+                self.presented_frame.blit(self.window, (0, 0))
+
+    def frame_array(self):
+        """Copy of the last presented frame (or, without `keep_frames`, of
+        whatever the display surface holds) as a (height, width, 3) uint8
+        NumPy array."""
+        if ray_kernel.np is None:
+            raise RuntimeError('frame_array() requires NumPy')
+        surface = self.window
+        if self.keep_frames and self.presented_frame is not None:
+            surface = self.presented_frame
+        return pg.surfarray.array3d(surface).transpose(1, 0, 2).copy()
 
     def update(self):
         if self.paused:
             return
 
-        self.player.update()
+        timer = self.stage_timer
+        if self.quality.update(timer.frame_ms):
+            self.apply_quality()
+
+        if self.fixed_timestep:
+            self.player.mouse_control()
+            timer.mark('player')
+            ticks = self.advance_clock()
+            if self.simulation:
+                # The frame is drawn from the snapshot while the ticks run.
+                self.world.capture(self)
+                self.simulation.start(ticks)
+            else:
+                self.run_ticks(ticks)
+                self.world.capture(self)
+            self.player.set_view(*self.world.view_pose(self.tick_alpha))
+        else:
+            self.player.update()
+            timer.mark('player')
+            self.player.set_view(*self.player.pose)
         self.ray_caster.update()
-        self.object_handler.update()
-        self.current_weapon.update()
+        timer.mark('ray_cast')
+        if self.fixed_timestep:
+            self.object_handler.project(self.world, self.tick_alpha)
+        else:
+            self.object_handler.update()
+            self.path_finder.update()
+        timer.mark('objects')
+        if not self.fixed_timestep:
+            self.current_weapon.update()
+            timer.mark('weapon')
         self.hud.update()
-        self.delta_time = self.clock.tick(con.FPS)
+        timer.mark('hud')
+        self.frame_time = self.clock.tick(0 if self.headless else con.FPS)
+        if not self.fixed_timestep:
+            self.delta_time = self.frame_time
+        timer.skip()
         title = self.window_title
         # if con.DEBUG:
         fps_text = f'FPS: {self.clock.get_fps() :.1f}'
@@ -89,9 +237,51 @@ class Game:
         if con.SHOW_FPS:
             self.fps_text.update_text(fps_text)
             self.fps_text.draw()
+        if self.stage_overlay.enabled:
+            self.stage_overlay.draw()
 
         pg.display.set_caption(title)
-        pg.display.flip()
+        self.present()
+        timer.mark('present')
+
+    def tick(self, timed: bool = True):
+        """Advances the simulation by one fixed timestep. Stages are only
+        timed on the main thread."""
+        timer = self.stage_timer
+        self.player.save_pose()
+        self.object_handler.save_positions()
+        self.player.update()
+        if timed:
+            timer.mark('player')
+        self.object_handler.update()
+        self.path_finder.update()
+        if timed:
+            timer.mark('objects')
+        self.current_weapon.update()
+        if timed:
+            timer.mark('weapon')
+        # The global event only drives one tick.
+        self.global_trigger = False
+
+    def advance_clock(self) -> int:
+        """Adds the time since the last frame to the accumulator and returns
+        how many ticks it now covers."""
+        self.tick_accumulator = min(self.tick_accumulator + self.frame_time,
+                                    self.tick_ms * con.MAX_TICKS_PER_FRAME)
+        ticks = int(self.tick_accumulator // self.tick_ms)
+        self.tick_accumulator -= ticks * self.tick_ms
+        self.tick_alpha = self.tick_accumulator / self.tick_ms
+        return ticks
+
+    def run_ticks(self, ticks: int, timed: bool = True):
+        for _ in range(ticks):
+            self.tick(timed)
+
+    def defer(self, func: Callable[[], None]) -> bool:
+        """When called from a pipelined simulation tick, queues `func` to run
+        on the main thread once the ticks are done and returns True. Returns
+        False otherwise, in which case the caller goes ahead itself."""
+        return self.simulation is not None and self.simulation.defer(func)
 
     def draw(self):
         if con.DEBUG:
@@ -100,7 +290,10 @@ class Game:
             self.player.draw()
         else:
             self.object_renderer.draw()
-            self.current_weapon.draw()
+            self.stage_timer.mark('render')
+            image = self.world.weapon_image if self.fixed_timestep else None
+            self.current_weapon.draw(image)
+        self.stage_timer.mark('weapon_draw')
 
     def handle_pause(self):
         self.paused = not self.paused
@@ -120,7 +313,8 @@ class Game:
         pass
 
     def check_events(self):
-        self.global_trigger = False
+        if not self.fixed_timestep:
+            self.global_trigger = False
 
         events = self.input.get_input_events()
         for event in events:
@@ -137,21 +331,49 @@ class Game:
                 return
             elif event == InputEvent.GLOBAL_EVENT:
                 self.global_trigger = True
+            elif event == InputEvent.TOGGLE_STAGE_OVERLAY:
+                self.stage_overlay.toggle()
+            elif event == InputEvent.SAVE_FRAME_STATS:
+                self.frame_stats.save(con.FRAME_STATS_PATH)
 
         if not self.paused:
             self.player.single_fire_event(events)
 
         self.do_events(events)
 
-    def run(self):
+    def step(self):
+        """Runs one frame of the game loop."""
+        self.stage_timer.begin_frame()
+        if self.simulation:
+            self.simulation.wait()
+            self.stage_timer.mark('sync')
+        self.check_events()
+        self.stage_timer.mark('input')
+        if not self.paused and self.running:
+            self.update()
+            self.draw()
+            self.frame_count += 1
+            self.stage_timer.end_frame()
+            self.frame_stats.record(self.stage_timer.frame_ms,
+                                    self.stage_timer.stages)
+
+    def run(self, max_frames: int = 0):
+        """Runs the game loop until quit, or for `max_frames` frames when
+        that's non-zero."""
         self.running = True
+        self.frame_count = 0
         while self.running:
-            self.check_events()
-            if not self.paused and self.running:
-                self.update()
-                self.draw()
+            self.step()
+            if max_frames and self.frame_count >= max_frames:
+                self.running = False
 
+        if con.SAVE_FRAME_STATS_ON_QUIT:
+            self.frame_stats.save(con.FRAME_STATS_PATH)
         self.sound.fadeout()
         pg.time.wait(self.sound.fadeout_interval)
+        if self.simulation:
+            self.simulation.shutdown()
+        if self.strip_pool:
+            self.strip_pool.shutdown()
         pg.quit()
         sys.exit()
@@ -0,0 +1,90 @@
+import os
+import pygame as pg
+
+from engine import constants as con
+
+
+class GlyphAtlas:
+    """One font at one size, rasterized once into a single sheet of glyphs.
+
+    Strings are drawn by blitting each character's area of the sheet in one
+    batched `blits()` call, so nothing is rasterized when the text changes;
+    numbers that change every frame cost the same as fixed labels. Glyphs
+    are rendered in white and a tinted copy of the sheet is made the first
+    time each color is used. Characters outside printable ASCII are added to
+    the sheet the first time they're drawn.
+
+    Use `GlyphAtlas.get()`, which shares one atlas per font and size.
+    """
+
+    CHARS = ''.join(chr(code) for code in range(32, 127))
+    _atlases: dict[tuple[str, int], 'GlyphAtlas'] = {}
+
+    @classmethod
+    def get(cls, font_name: str, size: int) -> 'GlyphAtlas':
+        key = (font_name, size)
+        atlas = cls._atlases.get(key)
+        if atlas is None:
+            atlas = cls._atlases[key] = cls(font_name, size)
+        return atlas
+
+    def __init__(self, font_name: str, size: int):
+        font_path = os.path.join(con.FONT_BASE, font_name)
+        self.font: pg.font.Font = pg.font.Font(font_path, size)
+        self.height: int = self.font.get_height()
+        self.sheet: pg.Surface = pg.Surface((1, self.height), pg.SRCALPHA)
+        self.rects: dict[str, pg.Rect] = {}
+        self.advances: dict[str, int] = {}
+        self.tinted: dict[tuple[int, int, int], pg.Surface] = {}
+        self._add_glyphs(self.CHARS)
+
+    def _add_glyphs(self, chars: str):
+        glyphs = [(char, self.font.render(char, True, (255, 255, 255)))
+                  for char in chars]
+        x = self.sheet.get_width()
+        width = x + sum(glyph.get_width() for _, glyph in glyphs)
+        height = max([self.height] +
+                     [glyph.get_height() for _, glyph in glyphs])
+        sheet = pg.Surface((width, height), pg.SRCALPHA)
+        # The sheet starts out fully transparent, so taking the maximum
+        # copies glyphs exactly rather than blending them.
+        sheet.blit(self.sheet, (0, 0), special_flags=pg.BLEND_RGBA_MAX)
+        for (char, glyph), metrics in zip(glyphs,
+                                          self.font.metrics(chars)):
+            sheet.blit(glyph, (x, 0), special_flags=pg.BLEND_RGBA_MAX)
+            self.rects[char] = pg.Rect(x, 0, glyph.get_width(),
+                                       glyph.get_height())
+            self.advances[char] = metrics[4] if metrics else glyph.get_width()
+            x += glyph.get_width()
+        self.sheet = sheet.convert_alpha()
+        self.tinted = {}
+
+    def _sheet(self, color: tuple[int, int, int]) -> pg.Surface:
+        sheet = self.tinted.get(color)
+        if sheet is None:
+            sheet = self.sheet.copy()
+            sheet.fill((*color, 255), special_flags=pg.BLEND_RGBA_MULT)
+            self.tinted[color] = sheet
+        return sheet
+
+    def size(self, string: str) -> tuple[int, int]:
+        missing = ''.join(set(string) - self.rects.keys())
+        if missing:
+            self._add_glyphs(missing)
+        return sum(self.advances[char] for char in string), self.height
+
+    def draw(self, surface: pg.Surface, string: str,
+             pos: tuple[float, float], color: tuple[int, int, int]):
+        missing = ''.join(set(string) - self.rects.keys())
+        if missing:
+            self._add_glyphs(missing)
+
+        sheet = self._sheet(color)
+        x, y = pos
+        rects = self.rects
+        advances = self.advances
+        blits = []
+        for char in string:
+            blits.append((sheet, (x, y), rects[char]))
+            x += advances[char]
+        surface.blits(blits, False)
@@ -20,32 +20,50 @@ class Hud:
         self.rect.topleft = (0, h - win_h)
         text_y = self.rect.y + int(self.rect.height / 2.5)
         text_x = int(self.rect.width / 35)
+        font_size = int(35 * self.game.render_config.ui_scale)
         self.armor_text: Text = Text(game, (text_x, text_y), 'ARMOR',
-                                     RGBColors.DARK_GRAY, 'DUGAFONT.ttf', 35)
+                                     RGBColors.DARK_GRAY, 'DUGAFONT.ttf',
+                                     font_size)
         text_x = int(self.rect.width / 3.4)
         self.health_text: Text = Text(game, (text_x, text_y), 'HEALTH',
-                                      RGBColors.DARK_GRAY, 'DUGAFONT.ttf', 35)
+                                      RGBColors.DARK_GRAY, 'DUGAFONT.ttf',
+                                      font_size)
         text_x = int(self.rect.width / 1.8)
         self.ammo_text: Text = Text(game, (text_x, text_y), 'AMMO',
-                                    RGBColors.DARK_GRAY, 'DUGAFONT.ttf', 35)
+                                    RGBColors.DARK_GRAY, 'DUGAFONT.ttf',
+                                    font_size)
         text_x = self.rect.width / 1.2
         self.wpn_text: Text = Text(game, (text_x, text_y), 'WEAPON',
-                                   RGBColors.DARK_GRAY, 'DUGAFONT.ttf', 35)
+                                   RGBColors.DARK_GRAY, 'DUGAFONT.ttf',
+                                   font_size)
         self.all_text: list[Text] = [self.armor_text, self.health_text,
                                      self.ammo_text, self.wpn_text]
+        # The background with the current text on it, redrawn only when one
+        # of the values shown changes.
+        self.surface: pg.Surface = self.sprite.copy()
+        self.values: tuple = ()
+
+    def compose(self):
+        self.surface.blit(self.sprite, (0, 0))
+        for text in self.all_text:
+            x, y = text.pos
+            text.draw(self.surface, (x - self.rect.x, y - self.rect.y))
 
     def update(self):
-        self.game.screen.blit(self.sprite, self.rect)
         p_armor = self.game.player.armor
         p_health = self.game.player.health
         tot_ammo = self.game.current_weapon.total_ammo
         rem_ammo = self.game.current_weapon.ammo_remaining
         wpn_name = self.game.current_weapon.name
 
-        self.armor_text.update_text(f'{p_armor} / {con.PLAYER_MAX_ARMOR}')
-        self.health_text.update_text(f'{p_health} / {con.PLAYER_MAX_HEALTH}')
-        self.ammo_text.update_text(f'{rem_ammo} / {tot_ammo}')
-        self.wpn_text.update_text(wpn_name)
+        values = (p_armor, p_health, tot_ammo, rem_ammo, wpn_name)
+        if values != self.values:
+            self.values = values
+            self.armor_text.update_text(f'{p_armor} / {con.PLAYER_MAX_ARMOR}')
+            self.health_text.update_text(
+                f'{p_health} / {con.PLAYER_MAX_HEALTH}')
+            self.ammo_text.update_text(f'{rem_ammo} / {tot_ammo}')
+            self.wpn_text.update_text(wpn_name)
+            self.compose()
 
-        for text in self.all_text:
-            text.draw()
+        self.game.screen.blit(self.surface, self.rect)
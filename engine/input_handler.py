@@ -24,6 +24,8 @@ class InputEvent(Enum):
     WEAPON_FIRE = 6
     WEAPON_FIRE_STOP = 7
     GLOBAL_EVENT = 8
+    TOGGLE_STAGE_OVERLAY = 9
+    SAVE_FRAME_STATS = 10
 
 
 class InputHandler:
@@ -43,8 +45,12 @@ class InputHandler:
         self.joy_right_bumper: int = 10
         self.joy_d_pad_x_axis: int = 0
         self.joy_d_pad_y_axis: int = 1
-        pg.mouse.set_visible(con.DEBUG)
-        pg.event.set_grab(True)
+        # Headless games have no display to grab and nobody at the keyboard,
+        # so their input is ignored.
+        self.enabled: bool = not game.headless
+        if self.enabled:
+            pg.mouse.set_visible(con.DEBUG)
+            pg.event.set_grab(True)
 
     @property
     def joystick(self) -> Optional[pg.joystick.Joystick]:
@@ -61,19 +67,26 @@ class InputHandler:
         [print(f'Found joystick: {j.get_name()}') for j in self.all_joysticks]
 
     def get_mouse_movement(self) -> Optional[tuple[int, int]]:
-        if not pg.mouse.get_focused():
+        if not self.enabled or not pg.mouse.get_focused():
             return None
 
+        # Mouse coordinates are in window pixels, which need not match the
+        # render resolution.
+        window_w, window_h = self.game.render_config.window_res
         mx, my = pg.mouse.get_pos()
-        if mx < con.MOUSE_BORDER_LEFT or mx > con.MOUSE_BORDER_RIGHT:
-            pg.mouse.set_pos([con.HALF_WIDTH, con.HALF_HEIGHT])
+        border_right = window_w - con.MOUSE_BORDER_LEFT
+        if mx < con.MOUSE_BORDER_LEFT or mx > border_right:
+            pg.mouse.set_pos([window_w // 2, window_h // 2])
 
         rel = pg.mouse.get_rel()[0]
         rel = max(-con.MOUSE_MAX_REL, min(con.MOUSE_MAX_REL, rel))
-        angle = rel * self.mouse_sensitivity * self.game.delta_time
+        angle = rel * self.mouse_sensitivity * self.game.frame_time
         return rel, angle
 
     def get_player_movement(self) -> set[Movement]:
+        if not self.enabled:
+            return set()
+
         keys = pg.key.get_pressed()
         joy = self.joystick
         joy_left_bump = joy.get_button(self.joy_left_bumper) if joy else False
@@ -103,6 +116,13 @@ class InputHandler:
     def get_input_events(self) -> set[InputEvent]:
         result = set()
         for event in pg.event.get():
+            if not self.enabled and event.type in (pg.KEYDOWN, pg.KEYUP,
+                                                   pg.JOYBUTTONDOWN,
+                                                   pg.JOYBUTTONUP,
+                                                   pg.MOUSEBUTTONDOWN,
+                                                   pg.MOUSEBUTTONUP):
+                continue
+
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_m:
                     result.add(InputEvent.SCREENSHOT)
@@ -118,6 +138,10 @@ class InputHandler:
                     result.add(InputEvent.WEAPON_FIRE)
                 elif event.key == pg.K_TAB:
                     result.add(InputEvent.WEAPON_SWITCH)
+                elif event.key == pg.K_F3:
+                    result.add(InputEvent.TOGGLE_STAGE_OVERLAY)
+                elif event.key == pg.K_F4:
+                    result.add(InputEvent.SAVE_FRAME_STATS)
             elif event.type == pg.JOYBUTTONDOWN:
                 if event.button == self.joy_pause_button:
                     result.add(InputEvent.PAUSE)
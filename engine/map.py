@@ -1,5 +1,10 @@
+from functools import partial
 import pygame as pg
-from typing import Optional
+from typing import Callable, Optional
+
+from engine import constants as con
+from engine.pvs import PotentiallyVisibleSet
+from engine.tile_grid import TileGrid
 
 
 _ = False
@@ -53,22 +58,34 @@ class Map:
         self.pickups: list[tuple[int, int]] = []
         self.rows: int = len(self.mini_map)
         self.cols: int = len(self.mini_map[0])
+        self.grid: TileGrid = TileGrid(self.rows, self.cols)
+        self.pvs: PotentiallyVisibleSet = PotentiallyVisibleSet(self.rows,
+                                                                self.cols)
         self.sky_texture: Optional[pg.Surface] = None
         self.sky_offset: int = 0
         self.floor_texture: Optional[pg.Surface] = None
+        self.ceiling_texture: Optional[pg.Surface] = None
         self.floor_color: Optional[pg.Color] = None
         self.music_track: Optional[str] = None
         self.sprite_map_path: Optional[str] = None
         self.enemy_count: int = 0
         self.won: bool = False
         self.enemies: Optional[list[str]] = None
+        # PathFinder mode, see PATHFINDING. None picks one by the map's size.
+        self.pathfinding: Optional[str] = None
+        # Bumped whenever a tile changes (doors opening, obstacles, etc).
+        self.revision: int = 0
+        # Called with the tile whenever an obstacle is added to or removed
+        # from it.
+        self.obstacle_listeners: list[Callable[[tuple[int, int]], None]] = []
 
     def load_map(self):
         print(f'Loading map: {self.name}')
         if self.music_track:
             self.game.sound.music_path = self.music_track
 
-        # TODO Load floor texture
+        self.game.object_renderer.floor_texture = self.floor_texture
+        self.game.object_renderer.ceiling_texture = self.ceiling_texture
 
         if self.floor_color:
             self.game.object_renderer.floor_color = self.floor_color
@@ -84,6 +101,19 @@ class Map:
                 if value:
                     self.world_map[(i, j)] = value
 
+        self.grid = TileGrid.from_mini_map(self.mini_map)
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        for obstacle in self.obstacles:
+            self.grid.set_flag(*obstacle, TileGrid.OBSTACLE)
+        for pickup in self.pickups:
+            self.grid.set_flag(int(pickup[0]), int(pickup[1]), TileGrid.PICKUP)
+        if con.USE_PVS:
+            self.pvs = PotentiallyVisibleSet.build(self.grid)
+        else:
+            self.pvs = PotentiallyVisibleSet(self.rows, self.cols)
+        self.revision += 1
+
     def draw(self):
         [
             pg.draw.rect(self.game.screen, 'darkgray',
@@ -91,20 +121,51 @@ class Map:
             for pos in self.world_map
         ]
 
-    def add_obstacle(self, obstacle: tuple[int, int]):
+    def add_obstacle(self, obstacle: tuple[int, int], door: bool = False):
+        # The walls are ray cast while the simulation runs when it's
+        # pipelined, so they only change between ticks.
+        if self.game.defer(partial(self.add_obstacle, obstacle, door)):
+            return
+
         self.obstacles.append(obstacle)
+        flags = TileGrid.OBSTACLE | TileGrid.DOOR if door else TileGrid.OBSTACLE
+        self.grid.set_flag(*obstacle, flags)
+        self.revision += 1
+        self.notify_obstacle(obstacle)
 
     def remove_obstacle(self, obstacle: tuple[int, int]):
+        if self.game.defer(partial(self.remove_obstacle, obstacle)):
+            return
+
         self.obstacles.remove(obstacle)
+        if obstacle not in self.obstacles:
+            self.grid.clear_flag(*obstacle, TileGrid.OBSTACLE | TileGrid.DOOR)
+        self.revision += 1
+        self.notify_obstacle(obstacle)
+
+    def notify_obstacle(self, obstacle: tuple[int, int]):
+        for listener in self.obstacle_listeners:
+            listener(obstacle)
 
     def has_obstacle(self, obstacle: tuple[int, int]):
-        return obstacle in self.obstacles
+        return self.grid.has_flag(*obstacle, TileGrid.OBSTACLE)
 
     def add_pickup(self, pickup: tuple[int, int]):
         self.pickups.append(pickup)
+        self.grid.set_flag(int(pickup[0]), int(pickup[1]), TileGrid.PICKUP)
 
     def remove_pickup(self, pickup: tuple[int, int]):
         self.pickups.remove(pickup)
+        x, y = int(pickup[0]), int(pickup[1])
+        if not any(int(px) == x and int(py) == y for px, py in self.pickups):
+            self.grid.clear_flag(x, y, TileGrid.PICKUP)
 
     def has_pickup(self, pickup: tuple[int, int]):
-        return pickup in self.pickups
+        return self.grid.has_flag(int(pickup[0]), int(pickup[1]),
+                                  TileGrid.PICKUP)
+
+    def is_wall(self, x: int, y: int) -> bool:
+        return self.grid.is_wall(x, y)
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        return self.grid.is_blocked(x, y)
@@ -7,6 +7,7 @@ from engine.common import align_grid
 from engine.enemy import Enemy
 from engine.sprite import AnimatedSprite
 from engine.sprite import Sprite
+from engine.world_snapshot import WorldSnapshot
 
 
 class ObjectHandler:
@@ -23,6 +24,8 @@ class ObjectHandler:
         self.enemy_count: int = 20
         self.enemy_types: list[str] = []
         self.weights: list[int] = []
+        # Tiles potentially visible from the player's tile this frame.
+        self.visible_tiles: int = -1
 
     def setup(self):
         pass
@@ -36,13 +39,13 @@ class ObjectHandler:
             x = randrange(self.game.map.cols)
             y = randrange(self.game.map.rows)
             pos = x, y
-            pos_in_map = pos in self.game.map.world_map
+            pos_in_map = self.game.map.grid.is_wall(x, y)
             pos_in_res_area = pos in self.restricted_area
             while pos_in_map or pos_in_res_area:
                 x = randrange(self.game.map.cols)
                 y = randrange(self.game.map.rows)
                 pos = x, y
-                pos_in_map = pos in self.game.map.world_map
+                pos_in_map = self.game.map.grid.is_wall(x, y)
                 pos_in_res_area = pos in self.restricted_area
 
             npc_type = choices(self.enemy_types, self.weights)[0]
@@ -82,13 +85,34 @@ class ObjectHandler:
 
     def check_win(self):
         if not len(self.enemy_positions):
+            if self.game.defer(self.check_win):
+                return
             self.game.object_renderer.win()
-            pg.display.flip()
+            self.game.present()
             pg.time.delay(1500)
             self.game.map.won = True
             self.game.new_game()
 
+    def can_see(self, x: float, y: float, radius: float = 0.5,
+                visible: Optional[int] = None) -> bool:
+        """Whether anything within `radius` of (x, y) might be visible from
+        the player's tile, going by the map's potentially visible set.
+        `visible` overrides the tiles visible from the player's tile."""
+        if visible is None:
+            visible = self.visible_tiles
+        if visible == -1:
+            return True
+
+        pvs = self.game.map.pvs
+        for y_tile in range(int(y - radius), int(y + radius) + 1):
+            for x_tile in range(int(x - radius), int(x + radius) + 1):
+                if pvs.tile_visible(visible, x_tile, y_tile):
+                    return True
+        return False
+
     def update(self):
+        self.visible_tiles = self.game.map.pvs.visible_from(
+            *self.game.player.map_pos)
         self.enemy_positions = {
             npc.map_pos
             for npc in self.enemy_list if npc.alive
@@ -112,6 +136,34 @@ class ObjectHandler:
         [npc.update() for npc in self.enemy_list]
         self.check_win()
 
+    def save_positions(self):
+        # Called at the start of every simulation tick.
+        [sprite.save_pos() for sprite in self.sprite_list]
+        [npc.save_pos() for npc in self.enemy_list]
+
+    def project(self, world: WorldSnapshot, alpha: float):
+        """Queues the snapshot's sprites and enemies for drawing at their
+        positions `alpha` of the way through the current tick, as seen from
+        the player's view pose. Only the snapshot is read and no sprite is
+        changed, so this can run while the next tick is being simulated."""
+        player = self.game.player
+        # The angle the walls were cast at, which can trail the player's
+        # by part of a column while turning (see RayCaster.rotate_columns()).
+        px, py = player.view_x, player.view_y
+        angle = self.game.ray_caster.view_angle
+        visible = self.game.map.pvs.visible_from(int(px), int(py))
+        objects_to_render = self.game.ray_caster.objects_to_render
+        for sprite, prev_x, prev_y, x, y, image in world.sprites:
+            if image is None:
+                continue
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+            _, _, _, screen_x, _, norm_dist = sprite.locate(x, y, px, py,
+                                                            angle)
+            if sprite.on_screen(x, y, screen_x, norm_dist, visible):
+                objects_to_render.append(
+                    sprite.draw_entry(image, screen_x, norm_dist))
+
     def add_enemy(self, enemy: Optional[Enemy]):
         if enemy:
             self.enemy_list.append(enemy)
@@ -3,6 +3,10 @@ import pygame as pg
 from typing import Optional
 
 from engine import constants as con
+from engine import ray_kernel
+from engine.column_cache import ColumnCache
+from engine.floor_renderer import FloorRenderer
+from engine.wall_renderer import WallRenderer
 
 
 class ObjectRenderer:
@@ -21,17 +25,28 @@ class ObjectRenderer:
         self.game_over_image: Optional[pg.Surface] = None
         self.win_image: Optional[pg.Surface] = None
         self.floor_color: pg.Color = pg.Color(con.DEFAULT_FLOOR_COLOR)
-        # TODO Need to support a floor texture
+        # Textured floors/ceilings need the frame buffer renderer. Without it
+        # the floor color and sky are drawn instead.
+        self.floor_texture: Optional[pg.Surface] = None
+        self.ceiling_texture: Optional[pg.Surface] = None
+        self.wall_renderer: Optional[WallRenderer] = None
+        self.floor_renderer: Optional[FloorRenderer] = None
+        self.column_cache: ColumnCache = ColumnCache(con.COLUMN_CACHE_MAX_BYTES)
 
     def setup(self):
+        config = self.game.render_config
+        self.screen = self.game.screen
         self.wall_textures = self.load_wall_textures(con.WALL_TEXTURE_BASE)
+        self.setup_wall_renderer()
+        sky_res = (config.width, config.half_height)
         if self.sky_image is None:
             sky_tex_path: str = os.path.join(con.TEXTURE_BASE, 'sky.png')
-            res = (con.WIDTH, con.HALF_HEIGHT)
-            self.sky_image = self.get_texture(sky_tex_path, res)
+            self.sky_image = self.get_texture(sky_tex_path, sky_res)
+        elif self.sky_image.get_size() != sky_res:
+            self.sky_image = pg.transform.scale(self.sky_image, sky_res)
 
         blood_screen_path: str = os.path.join(con.TEXTURE_BASE, 'blood_screen.png')
-        self.blood_screen = self.get_texture(blood_screen_path, con.RES)
+        self.blood_screen = self.get_texture(blood_screen_path, config.res)
 
         # TODO Health display is in the HUD now. Remove this but maybe keep assets for future use?
         # health_digits_path: str = con.DIGITS_TEXTURE_BASE
@@ -46,10 +61,24 @@ class ObjectRenderer:
         #     self.health = dict(zip(map(str, range(11)), self.digit_images))
 
         game_over_path: str = os.path.join(con.TEXTURE_BASE, 'game_over.png')
-        self.game_over_image = self.get_texture(game_over_path, con.RES)
+        self.game_over_image = self.get_texture(game_over_path, config.res)
 
         win_path: str = os.path.join(con.TEXTURE_BASE, 'win.png')
-        self.win_image = self.get_texture(win_path, con.RES)
+        self.win_image = self.get_texture(win_path, config.res)
+
+    def setup_wall_renderer(self):
+        self.column_cache.clear()
+        if (con.USE_FRAMEBUFFER_RENDERER and con.USE_NUMPY_RAYCASTER and
+                ray_kernel.HAS_NUMPY):
+            if (self.wall_renderer is None or
+                    self.wall_renderer.config != self.game.render_config):
+                self.wall_renderer = WallRenderer(self.game)
+            self.wall_renderer.setup(self.wall_textures)
+            frame = self.wall_renderer.frame
+            self.floor_renderer = FloorRenderer(self.game.render_config,
+                                                self.wall_renderer.color_key)
+            self.floor_renderer.setup(frame, self.floor_texture,
+                                      self.ceiling_texture)
 
     @staticmethod
     def get_texture(path: str, res: tuple[int, int] = (con.TEXTURE_SIZE, con.TEXTURE_SIZE))\
@@ -91,29 +120,81 @@ class ObjectRenderer:
         if self.blood_screen:
             self.screen.blit(self.blood_screen, (0, 0))
 
-    def draw_background(self):
+    def draw_sky(self):
+        config = self.game.render_config
         if self.sky_image:
-            offset = (self.sky_offset + 4.5 * self.game.player.rel)
-            self.sky_offset = offset % con.WIDTH
+            # The sky scroll speed is tuned for the default width.
+            offset = (self.sky_offset + 4.5 * self.game.player.rel *
+                      config.width / con.WIDTH)
+            self.sky_offset = offset % config.width
             self.screen.blit(self.sky_image, (-self.sky_offset, 0))
-            self.screen.blit(self.sky_image, (-self.sky_offset + con.WIDTH, 0))
+            self.screen.blit(self.sky_image,
+                             (-self.sky_offset + config.width, 0))
         else:
             self.screen.fill('black')
 
-        # Now, the floor
-        # TODO Prefer floor texture if defined, over floor color
-        # TODO Fallback to default floor color if neither defined.
-        rect = (0, con.HALF_HEIGHT, con.WIDTH, con.HEIGHT)
-        pg.draw.rect(self.screen, self.floor_color, rect)
+    def draw_background(self):
+        # Textured floors and ceilings are cast into the frame buffer, so
+        # only the untextured parts are drawn here.
+        floor = self.floor_renderer
+        if floor is None or floor.ceiling is None:
+            self.draw_sky()
+
+        if floor is None or floor.floor is None:
+            config = self.game.render_config
+            rect = (0, config.half_height, config.width, config.height)
+            pg.draw.rect(self.screen, self.floor_color, rect)
+
+    def render_sprites(self):
+        # Sprites are painted back to front, clipped column by column against
+        # the depth buffer. Hidden sprites are never scaled.
+        ray_caster = self.game.ray_caster
+        depth_buffer = ray_caster.depth_buffer
+        sprites = sorted(ray_caster.objects_to_render, key=lambda t: t[0],
+                         reverse=True)
+        for depth, sprite, image, pos, size in sprites:
+            x, y = int(pos[0]), int(pos[1])
+            runs = depth_buffer.visible_runs(depth, x, x + size[0])
+            if not runs:
+                continue
+
+            scaled = sprite.scale_image(image, size)
+            if runs == [(x, x + size[0])]:
+                self.screen.blit(scaled, (x, y))
+                continue
+
+            for start, end in runs:
+                area = pg.Rect(start - x, 0, end - start, size[1])
+                self.screen.blit(scaled, (start, y), area)
 
     def render_game_objects(self):
-        objs_to_render = self.game.ray_caster.objects_to_render
-        objects = sorted(objs_to_render, key=lambda t: t[0], reverse=True)
-        for unused_depth, image, pos in objects:
-            self.screen.blit(image, pos)
+        # Wall columns don't overlap, so they are drawn in any order.
+        self.screen.blits([(image, pos) for unused_depth, image, pos
+                           in self.game.ray_caster.wall_objects], False)
+        self.render_sprites()
 
-    def draw(self):
+    def render_frame_buffer(self):
+        ray_caster = self.game.ray_caster
         self.draw_background()
-        self.render_game_objects()
+        if ray_caster.walls_changed:
+            self.wall_renderer.draw_walls(ray_caster.proj_heights,
+                                          ray_caster.texture_ids,
+                                          ray_caster.texture_offsets,
+                                          self.game.strip_pool)
+            if self.floor_renderer:
+                self.floor_renderer.draw(self.wall_renderer.frame,
+                                         ray_caster.cast_pos,
+                                         ray_caster.view_angle,
+                                         ray_caster.proj_heights)
+        self.screen.blit(self.wall_renderer.frame, (0, 0))
+        self.render_sprites()
+
+    def draw(self):
+        self.game.ray_caster.limit_sprites(self.game.quality.level.max_sprites)
+        if self.wall_renderer and self.game.ray_caster.use_numpy:
+            self.render_frame_buffer()
+        else:
+            self.draw_background()
+            self.render_game_objects()
         # TODO Health display is in the HUD now.
         # self.draw_player_health()
@@ -1,27 +1,121 @@
 from collections import deque
+from functools import partial
+import heapq
+import math
+import time
+from typing import Optional
+
+from engine import constants as con
+from engine.cluster_graph import ClusterGraph
 
 
 class PathFinder:
+    """Finds the next tile an enemy should step to on its way to a goal, in
+    the map's pathfinding mode (see PATHFINDING)."""
+
+    LATENCY_SAMPLES = 100
+
+    MODES = ('flow', 'astar', 'hpa', 'bfs')
+    DIAGONAL_COST = math.sqrt(2)
 
     def __init__(self, game):
         self.game = game
+        self.level = game.map
         self.map = game.map.mini_map
+        grid = game.map.grid
+        self.mode: str = game.map.pathfinding
+        if self.mode is None:
+            large = grid.rows * grid.cols >= con.HPA_AUTO_TILES
+            self.mode = 'hpa' if large else con.PATHFINDING
+        elif self.mode not in self.MODES:
+            print(f'Unknown pathfinding mode: {self.mode}, '
+                  f'using {con.PATHFINDING}')
+            self.mode = con.PATHFINDING
         self.ways = [-1, 0], [0, -1], [1, 0], [0, 1], [-1, -1], [1, -1], [1, 1], [-1, 1]  # yapf: disable
         self.graph: dict = {}
+        # A*'s moves from each tile: (next tile, cost), without corner
+        # cutting.
+        self.moves: dict[tuple[int, int],
+                         list[tuple[tuple[int, int], float]]] = {}
         self.visited: dict = {}
-        self.get_graph()
+        # Steps from each reachable tile to `field_goal`.
+        self.field: dict[tuple[int, int], int] = {}
+        self.field_goal: Optional[tuple[int, int]] = None
+        self.field_builds: int = 0
+        # Each A* or HPA* path's goal and remaining tiles, last step first, by
+        # the enemy following it.
+        self.paths: dict[object, tuple[tuple[int, int],
+                                       Optional[list[tuple[int, int]]]]] = {}
+        self.searches: int = 0
+        # Requests waiting for update(), oldest first: owner -> (start, goal,
+        # time first requested).
+        self.requests: dict[object, tuple[tuple[int, int], tuple[int, int],
+                                          float]] = {}
+        # Answered requests, until their owners take them.
+        self.results: dict[object, tuple[int, int]] = {}
+        self.budget_ms: float = con.PATH_BUDGET_MS
+        self.requests_done: int = 0
+        self.peak_queue_depth: int = 0
+        # Milliseconds from request to answer of the last few requests.
+        self.latency_ms: deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self.hierarchy: Optional[ClusterGraph] = None
+        if self.mode == 'hpa':
+            self.hierarchy = ClusterGraph(grid)
+        else:
+            self.get_graph()
+        self.level.obstacle_listeners.append(self.on_obstacle)
+
+    def detach(self):
+        """Stops listening to the map, when it's replaced."""
+        if self.on_obstacle in self.level.obstacle_listeners:
+            self.level.obstacle_listeners.remove(self.on_obstacle)
 
     def get_next_nodes(self, x: int, y: int):
+        is_blocked = self.level.grid.is_blocked
         return [(x + dx, y + dy) for dx, dy in self.ways
-                if (x + dx, y + dy) not in self.game.map.world_map]
+                if not is_blocked(x + dx, y + dy)]
+
+    def get_moves(self, x: int, y: int):
+        return [((x + dx, y + dy), self.DIAGONAL_COST if dx and dy else 1)
+                for dx, dy in self.ways if self.can_step(x, y, dx, dy)]
+
+    def update_node(self, x: int, y: int):
+        node = (x, y)
+        if self.level.grid.is_blocked(x, y):
+            self.graph.pop(node, None)
+            self.moves.pop(node, None)
+        else:
+            self.graph[node] = self.get_next_nodes(x, y)
+            self.moves[node] = self.get_moves(x, y)
 
     def get_graph(self):
-        for y, row in enumerate(self.map):
-            for x, col in enumerate(row):
-                if not col:
-                    tup = (x, y)
-                    self.graph[tup] = self.graph.get(
-                        tup, []) + self.get_next_nodes(x, y)
+        grid = self.level.grid
+        for y in range(grid.rows):
+            for x in range(grid.cols):
+                self.update_node(x, y)
+
+    def on_obstacle(self, obstacle: tuple[int, int]):
+        # A tile's own edges and the edges and corners of the tiles around
+        # it are all that can change.
+        ox, oy = obstacle
+        tiles = {(ox + dx, oy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+        if self.hierarchy:
+            self.hierarchy.on_blocked_changed(ox, oy)
+        else:
+            grid = self.level.grid
+            for x, y in tiles:
+                if 0 <= x < grid.cols and 0 <= y < grid.rows:
+                    self.update_node(x, y)
+
+        if not tiles.isdisjoint(self.field):
+            self.field_goal = None
+        # Paths through the changed tiles are replanned, and so are enemies
+        # that had no way through before.
+        self.paths = {
+            owner: (goal, path)
+            for owner, (goal, path) in self.paths.items()
+            if path is not None and tiles.isdisjoint(path)
+        }
 
     def bfs(self, start: int, goal: int, graph: dict):
         queue = deque([start])
@@ -31,7 +125,7 @@ class PathFinder:
             if cur_node == goal:
                 break
 
-            next_nodes = graph[cur_node]
+            next_nodes = graph.get(cur_node, ())
 
             for next_node in next_nodes:
                 if (next_node not in visited and next_node
@@ -40,7 +134,206 @@ class PathFinder:
                     visited[next_node] = cur_node
         return visited
 
-    def get_path(self, start: int, goal: int):
+    def build_field(self, goal: tuple[int, int]):
+        # Moves are symmetric, so searching outwards from the goal gives
+        # every tile's distance to it.
+        field = {goal: 0}
+        queue = deque([goal])
+        graph = self.graph
+        while queue:
+            node = queue.popleft()
+            steps = field[node] + 1
+            for next_node in graph.get(node, ()):
+                if next_node not in field:
+                    field[next_node] = steps
+                    queue.append(next_node)
+
+        self.field = field
+        self.field_goal = goal
+        self.field_builds += 1
+
+    def flow_step(self, start: tuple[int, int],
+                  goal: tuple[int, int]) -> tuple[int, int]:
+        if goal != self.field_goal:
+            self.build_field(goal)
+
+        field = self.field
+        steps = field.get(start)
+        if not steps:
+            # Already there, or no way there; head straight for the goal.
+            return goal
+
+        occupied = self.game.object_handler.enemy_positions
+        best = None
+        for next_node in self.graph.get(start, ()):
+            if field.get(next_node, steps) < steps:
+                if next_node not in occupied:
+                    return next_node
+                if best is None:
+                    best = next_node
+        return best or goal
+
+    def can_step(self, x: int, y: int, dx: int, dy: int) -> bool:
+        # Diagonal steps need both tiles beside them clear, so they never
+        # cut across the corner of a wall.
+        is_blocked = self.level.grid.is_blocked
+        if is_blocked(x + dx, y + dy):
+            return False
+        return not dx or not dy or not (is_blocked(x + dx, y) or
+                                        is_blocked(x, y + dy))
+
+    def astar(self, start: tuple[int, int], goal: tuple[int, int],
+              avoid: set) -> Optional[list[tuple[int, int]]]:
+        """Shortest path from `start` to `goal` going around the tiles in
+        `avoid` (other than the goal), last step first and without `start`,
+        or None if there isn't one."""
+        gx, gy = goal
+        diagonal = self.DIAGONAL_COST - 2
+        moves = self.moves
+        cost = {start: 0}
+        came_from = {start: None}
+        open_set = [(0, 0, start)]
+        while open_set:
+            _, node_cost, node = heapq.heappop(open_set)
+            if node == goal:
+                path = []
+                while node != start:
+                    path.append(node)
+                    node = came_from[node]
+                return path
+            if node_cost > cost[node]:
+                continue
+
+            for next_node, step in moves.get(node, ()):
+                next_cost = node_cost + step
+                if (next_cost >= cost.get(next_node, math.inf) or
+                        (next_node in avoid and next_node != goal)):
+                    continue
+
+                cost[next_node] = next_cost
+                came_from[next_node] = node
+                h_x = abs(gx - next_node[0])
+                h_y = abs(gy - next_node[1])
+                # Octile distance.
+                heuristic = h_x + h_y + diagonal * min(h_x, h_y)
+                heapq.heappush(open_set,
+                               (next_cost + heuristic, next_cost, next_node))
+        return None
+
+    def astar_step(self, start: tuple[int, int], goal: tuple[int, int],
+                   owner: object) -> tuple[int, int]:
+        occupied = self.game.object_handler.enemy_positions
+        return self.follow_path(start, goal, owner, occupied,
+                                partial(self.astar_around, start, goal,
+                                        occupied))
+
+    def astar_around(self, start: tuple[int, int], goal: tuple[int, int],
+                     occupied: set) -> Optional[list[tuple[int, int]]]:
+        # If other enemies are in the way of every path, take the one they're
+        # in and wait behind them. Only walls and obstacles leave no path,
+        # which is kept until the goal moves.
+        path = self.astar(start, goal, occupied)
+        if path is None and occupied:
+            path = self.astar(start, goal, set())
+        return path
+
+    def hpa_step(self, start: tuple[int, int], goal: tuple[int, int],
+                 owner: object) -> tuple[int, int]:
+        # The cluster graph doesn't know where enemies are, so they only
+        # hold each other up rather than cause a new search.
+        return self.follow_path(
+            start, goal, owner, (),
+            partial(self.hierarchy.find_path, start, goal))
+
+    def follow_path(self, start: tuple[int, int], goal: tuple[int, int],
+                    owner: object, avoid, search) -> tuple[int, int]:
+        """Next step of `owner`'s kept path, or of a new one from `search()`
+        if the goal has changed or the next step is blocked or in `avoid`.
+        """
+        goal_path = self.paths.get(owner)
+        if goal_path and goal_path[0] == goal:
+            path = goal_path[1]
+            if path is None:
+                # Still no way there.
+                return goal
+            if start in path:
+                del path[path.index(start):]
+            if not path:
+                return goal
+
+            x, y = start
+            next_x, next_y = path[-1]
+            dx, dy = next_x - x, next_y - y
+            if (max(abs(dx), abs(dy)) == 1 and
+                    path[-1] not in avoid and
+                    self.can_step(x, y, dx, dy)):
+                return path[-1]
+
+        self.searches += 1
+        path = search()
+        if owner is not None:
+            self.paths[owner] = (goal, path)
+        return path[-1] if path else goal
+
+    def request(self, start: tuple[int, int], goal: tuple[int, int],
+                owner: object):
+        """Queues a request for `owner`'s next step from `start` to `goal`,
+        which turns up in `results` once `update()` gets to it. Requesting
+        again before then just updates the request."""
+        queued = self.requests.get(owner)
+        since = queued[2] if queued else time.perf_counter()
+        self.requests[owner] = (start, goal, since)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self.requests))
+
+    def update(self):
+        """Answers queued requests until the budget is used up. At least one
+        is answered every time, so the queue always moves."""
+        requests = self.requests
+        if not requests:
+            return
+
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        while requests:
+            owner = next(iter(requests))
+            start, goal, since = requests.pop(owner)
+            self.results[owner] = self.get_path(start, goal, owner)
+            now = time.perf_counter()
+            self.latency_ms.append((now - since) * 1000)
+            self.requests_done += 1
+            if now >= deadline:
+                break
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.requests)
+
+    def to_dict(self) -> dict:
+        latency = self.latency_ms
+        mean = sum(latency) / len(latency) if latency else 0.0
+        hierarchy = self.hierarchy
+        return {
+            'mode': self.mode,
+            'budget_ms': self.budget_ms,
+            'queue_depth': self.queue_depth,
+            'peak_queue_depth': self.peak_queue_depth,
+            'requests_done': self.requests_done,
+            'searches': self.searches,
+            'field_builds': self.field_builds,
+            'cluster_builds': hierarchy.cluster_builds if hierarchy else 0,
+            'mean_latency_ms': round(mean, 3),
+            'max_latency_ms': round(max(latency, default=0.0), 3),
+        }
+
+    def get_path(self, start: int, goal: int, owner: object = None):
+        """Next tile to step to from `start` towards `goal`. `owner`
+        identifies who's asking, for modes that keep a path per enemy."""
+        if self.mode == 'flow':
+            return self.flow_step(start, goal)
+        if self.mode == 'astar':
+            return self.astar_step(start, goal, owner)
+        if self.mode == 'hpa':
+            return self.hpa_step(start, goal, owner)
+
         self.visited = self.bfs(start, goal, self.graph)
         path = [goal]
         step = self.visited.get(goal, start)
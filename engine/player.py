@@ -15,6 +15,14 @@ class Player(pg.sprite.Sprite):
         self.x: float = con.PLAYER_POS[0]
         self.y: float = con.PLAYER_POS[1]
         self.angle: int = con.PLAYER_ANGLE
+        # Pose at the start of the current simulation tick, and the pose
+        # frames are drawn from.
+        self.prev_x: float = self.x
+        self.prev_y: float = self.y
+        self.prev_angle: float = self.angle
+        self.view_x: float = self.x
+        self.view_y: float = self.y
+        self.view_angle: float = self.angle
         self.shot: bool = False
         self.health: int = con.PLAYER_MAX_HEALTH
         self.armor: int = 0
@@ -47,6 +55,8 @@ class Player(pg.sprite.Sprite):
         self.time_prev = pg.time.get_ticks()
         self.do_continuous_fire = False
         self.interact = False
+        self.save_pose()
+        self.set_view(*self.pose)
 
     @property
     def pos(self) -> tuple[float, float]:
@@ -56,6 +66,28 @@ class Player(pg.sprite.Sprite):
     def map_pos(self) -> tuple[int, int]:
         return int(self.x), int(self.y)
 
+    @property
+    def pose(self) -> tuple[float, float, float]:
+        return self.x, self.y, self.angle
+
+    @property
+    def view_pos(self) -> tuple[float, float]:
+        return self.view_x, self.view_y
+
+    @property
+    def view_map_pos(self) -> tuple[int, int]:
+        return int(self.view_x), int(self.view_y)
+
+    def save_pose(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_angle = self.angle
+
+    def set_view(self, x: float, y: float, angle: float):
+        self.view_x = x
+        self.view_y = y
+        self.view_angle = angle % math.tau
+
     def check_health_recovery_delay(self) -> bool:
         time_now = pg.time.get_ticks()
         delta = time_now - self.time_prev
@@ -107,9 +139,11 @@ class Player(pg.sprite.Sprite):
 
     def check_game_over(self):
         if self.health < 1:
+            if self.game.defer(self.check_game_over):
+                return
             print('Player died!')
             self.game.object_renderer.game_over()
-            pg.display.flip()
+            self.game.present()
             pg.time.delay(1500)
             self.game.new_game()
 
@@ -125,7 +159,8 @@ class Player(pg.sprite.Sprite):
             else:
                 print(f'Health damage: {damage}%')
                 self.health -= damage
-        self.game.object_renderer.player_damage()
+        if not self.game.defer(self.game.object_renderer.player_damage):
+            self.game.object_renderer.player_damage()
         self.play_pain_sound()
         self.check_game_over()
 
@@ -152,8 +187,7 @@ class Player(pg.sprite.Sprite):
             self.stop_weapon_fire()
 
     def check_wall(self, x: int, y: int) -> bool:
-        return ((x, y) not in self.game.map.world_map and
-                not self.game.map.has_obstacle((x, y)))
+        return not self.game.map.grid.is_blocked(x, y)
 
     def check_wall_collision(self, dx: float, dy: float):
         scale = con.PLAYER_SIZE_SCALE / self.game.delta_time
@@ -224,9 +258,10 @@ class Player(pg.sprite.Sprite):
     def draw(self):
         s_x = self.x * 100
         s_y = self.y * 100
+        width = self.game.render_config.width
         pg.draw.line(self.game.screen, 'yellow', (s_x, s_y),
-                     (s_x + con.WIDTH * math.cos(self.angle),
-                      s_y + con.WIDTH * math.sin(self.angle)), 2)
+                     (s_x + width * math.cos(self.angle),
+                      s_y + width * math.sin(self.angle)), 2)
         pg.draw.circle(self.game.screen, 'green', (s_x, s_y), 15)
 
     def mouse_control(self):
@@ -235,10 +270,14 @@ class Player(pg.sprite.Sprite):
             rel, angle = movement
             self.rel = rel
             self.angle += angle
+            # With a fixed timestep, mouse look is applied every frame rather
+            # than every tick, so it mustn't be interpolated away.
+            self.prev_angle += angle
 
     def update(self):
         self.movement()
-        self.mouse_control()
+        if not self.game.fixed_timestep:
+            self.mouse_control()
         self.recover_health()
         self.check_do_continuous_fire()
 
@@ -0,0 +1,194 @@
+from engine import constants as con
+from engine import ray_kernel
+from engine.tile_grid import TileGrid
+
+np = ray_kernel.np
+
+# Quadrants swept from each tile, as the directions x and y are followed in.
+# Together they take in every tile on its row or below it; the rest are
+# filled in from those, since seeing is mutual.
+_QUADRANTS = ((1, 1), (-1, 1))
+
+
+class PotentiallyVisibleSet:
+    """Precomputed tile to tile visibility for a map.
+
+    `bits` holds an int bitset (bit y * cols + x) per tile of the tiles that
+    can be seen from somewhere inside it: those a straight line from a point
+    in the tile reaches without passing through a wall. It's exact (precise
+    permissive field of view): each quadrant around the tile is swept
+    outwards, keeping the range of sight lines still open between the walls
+    found so far. A line only grazing a wall's corner gets past it, so a
+    tile may be in the set and still never be drawn, but never the other
+    way round.
+
+    Only walls occlude. Doors and other obstacles open and close, so they
+    are left transparent and the set stays valid for the whole level; the
+    runtime line of sight checks still stop at them.
+
+    Without NumPy, or on maps over PVS_MAX_TILES tiles, nothing is
+    precomputed and every tile counts as visible.
+    """
+
+    ALL = -1
+
+    def __init__(self, rows: int, cols: int):
+        self.rows: int = rows
+        self.cols: int = cols
+        self.bits: list[int] = []
+
+    @staticmethod
+    def build(grid: TileGrid):
+        pvs = PotentiallyVisibleSet(grid.rows, grid.cols)
+        rows, cols = grid.rows, grid.cols
+        count = rows * cols
+        if np is None or not count or count > con.PVS_MAX_TILES:
+            return pvs
+
+        walls = bytes(grid.is_wall(x, y) for y in range(rows)
+                      for x in range(cols))
+        # One packed bitset per tile.
+        packed = np.zeros((count, (count + 7) // 8), dtype=np.uint8)
+        for y in range(rows):
+            for x in range(cols):
+                source = y * cols + x
+                if walls[source]:
+                    continue
+                seen = bytearray(count)
+                seen[source] = 1
+                for sx, sy in _QUADRANTS:
+                    _sweep_quadrant(walls, cols, x, y, sx, sy,
+                                    cols - 1 - x if sx > 0 else x,
+                                    rows - 1 - y, seen)
+                seen = np.frombuffer(seen, dtype=bool)
+                packed[source] |= np.packbits(seen, bitorder='little')
+                packed[np.flatnonzero(seen), source >> 3] |= \
+                    np.uint8(1 << (source & 7))
+
+        pvs.bits = [int.from_bytes(row.tobytes(), 'little') for row in packed]
+        return pvs
+
+    def visible_from(self, x: int, y: int) -> int:
+        """Bitset of tiles potentially visible from tile (x, y)."""
+        if not self.bits or not (0 <= x < self.cols and 0 <= y < self.rows):
+            return self.ALL
+        # A tile nothing was seen from (an enclosed wall, say) has no
+        # sensible answer, so everything counts as visible.
+        return self.bits[y * self.cols + x] or self.ALL
+
+    def tile_visible(self, visible: int, x: int, y: int) -> bool:
+        """Checks tile (x, y) against a bitset from `visible_from`."""
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return True
+        return (visible >> (y * self.cols + x)) & 1 == 1
+
+    def can_see(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        return self.tile_visible(self.visible_from(*a), *b)
+
+
+
+# Sight lines are kept as views: the lines between a shallow and a steep
+# bounding line, in a quadrant's own coordinates, where the tile swept from
+# is the square (0, 0)-(1, 1) and x and y grow away from it. A bounding line
+# is [x0, y0, x1, y1] through two tile corners, and each view is
+# [shallow, steep, shallow bumps, steep bumps], the bumps being the wall
+# corners its lines have to pass, kept as (x, y, older bump) chains.
+
+
+def _side(line: list[int], x: int, y: int) -> int:
+    # > 0 when (x, y) is on the steep side of the line, < 0 on the shallow
+    # side and 0 on it.
+    x0, y0, x1, y1 = line
+    return (y1 - y0) * (x1 - x) - (x1 - x0) * (y1 - y)
+
+
+def _add_shallow_bump(view: list, x: int, y: int):
+    shallow = view[0]
+    shallow[2], shallow[3] = x, y
+    view[2] = (x, y, view[2])
+    bump = view[3]
+    while bump is not None:
+        if _side(shallow, bump[0], bump[1]) < 0:
+            shallow[0], shallow[1] = bump[0], bump[1]
+        bump = bump[2]
+
+
+def _add_steep_bump(view: list, x: int, y: int):
+    steep = view[1]
+    steep[2], steep[3] = x, y
+    view[3] = (x, y, view[3])
+    bump = view[2]
+    while bump is not None:
+        if _side(steep, bump[0], bump[1]) > 0:
+            steep[0], steep[1] = bump[0], bump[1]
+        bump = bump[2]
+
+
+def _is_open(view: list) -> bool:
+    # A view narrowed down to a single line along the edge of the tile swept
+    # from only grazes walls on either side.
+    shallow, steep = view[0], view[1]
+    return not (_side(shallow, steep[0], steep[1]) == 0 and
+                _side(shallow, steep[2], steep[3]) == 0 and
+                (_side(shallow, 0, 1) == 0 or _side(shallow, 1, 0) == 0))
+
+
+def _sweep_quadrant(walls: bytes, cols: int, x0: int, y0: int, sx: int,
+                    sy: int, extent_x: int, extent_y: int, seen: bytearray):
+    """Sets `seen` (a byte per tile) for the tiles seen from tile (x0, y0),
+    among those up to `extent_x` and `extent_y` tiles away in the quadrant
+    going sx, sy."""
+    views = [[[0, 1, max(extent_x, 1), 0], [1, 0, 0, max(extent_y, 1)],
+              None, None]]
+    # Tiles are visited a diagonal at a time, outwards from the tile, and
+    # along each diagonal from the shallowest to the steepest.
+    for i in range(1, extent_x + extent_y + 1):
+        if not views:
+            break
+        v = 0
+        for y in range(max(0, i - extent_x), min(i, extent_y) + 1):
+            x = i - y
+            # Skip the views the tile is entirely past on the steep side.
+            # (The side tests are _side() written out, as this runs for
+            # every tile seen.)
+            while v < len(views):
+                x_0, y_0, x_1, y_1 = views[v][1]
+                if (y_1 - y_0) * (x_1 - x - 1) < (x_1 - x_0) * (y_1 - y):
+                    break
+                v += 1
+            else:
+                break
+            view = views[v]
+            x_0, y_0, x_1, y_1 = view[0]
+            if (y_1 - y_0) * (x_1 - x) <= (x_1 - x_0) * (y_1 - y - 1):
+                continue
+
+            index = (y0 + y * sy) * cols + x0 + x * sx
+            seen[index] = 1
+            if not walls[index]:
+                continue
+
+            cuts_shallow = _side(view[0], x + 1, y) < 0
+            cuts_steep = _side(view[1], x, y + 1) > 0
+            if cuts_shallow and cuts_steep:
+                del views[v]
+            elif cuts_shallow:
+                _add_shallow_bump(view, x, y + 1)
+                if not _is_open(view):
+                    del views[v]
+            elif cuts_steep:
+                _add_steep_bump(view, x + 1, y)
+                if not _is_open(view):
+                    del views[v]
+            else:
+                # The wall splits the view in two, either side of it.
+                views.insert(v + 1, [list(view[0]), list(view[1]), view[2],
+                                     view[3]])
+                _add_steep_bump(view, x + 1, y)
+                if _is_open(view):
+                    v += 1
+                else:
+                    del views[v]
+                _add_shallow_bump(views[v], x, y + 1)
+                if not _is_open(views[v]):
+                    del views[v]
@@ -0,0 +1,139 @@
+from collections import deque
+from statistics import median
+from typing import Optional
+
+from engine import constants as con
+
+
+class QualityLevel:
+    """One step of the quality ladder.
+
+    column_width:     screen pixels per ray (fewer rays when wider).
+    sprite_size_step: projected sprite sizes are rounded down to a multiple
+                      of this, so rescaled images can be reused for longer.
+    ai_interval:      enemies refresh line of sight and paths every N ticks.
+    max_sprites:      only the N nearest sprites are drawn (0 = no limit).
+    """
+
+    def __init__(self, column_width: int, sprite_size_step: int,
+                 ai_interval: int, max_sprites: int):
+        self.column_width: int = column_width
+        self.sprite_size_step: int = sprite_size_step
+        self.ai_interval: int = ai_interval
+        self.max_sprites: int = max_sprites
+
+    def to_dict(self) -> dict:
+        return {
+            'column_width': self.column_width,
+            'sprite_size_step': self.sprite_size_step,
+            'ai_interval': self.ai_interval,
+            'max_sprites': self.max_sprites
+        }
+
+    def __repr__(self):
+        return f'QualityLevel({self.to_dict()})'
+
+
+# Highest quality first. Each step gives up a little more detail.
+QUALITY_LEVELS: list[QualityLevel] = [
+    QualityLevel(con.SCALE, 1, 1, 0),
+    QualityLevel(con.SCALE, 4, 1, 48),
+    QualityLevel(con.SCALE, 4, 2, 32),
+    QualityLevel(3, 8, 2, 24),
+    QualityLevel(4, 8, 3, 16),
+]
+
+
+class QualityGovernor:
+    """Steers the quality level towards a frame time budget.
+
+    Frame times are collected in windows of `window` frames and each window
+    is judged by its median, so single hitches (level loads, etc) are
+    ignored. Quality drops a level when a window is over budget and rises a
+    level when it is comfortably under (below `budget_ms * headroom`). The
+    band in between is left alone. If raising the quality immediately puts
+    the frame over budget again (in the very next window), the number of
+    good windows required before the next raise is doubled, so the level
+    settles instead of oscillating. It's halved again after every
+    `DECAY_WINDOWS` windows in a row within budget.
+    """
+
+    MAX_UPGRADE_WINDOWS = 16
+    DECAY_WINDOWS = 32
+
+    def __init__(self,
+                 budget_ms: float = con.FRAME_BUDGET_MS,
+                 window: int = con.QUALITY_WINDOW,
+                 headroom: float = con.QUALITY_HEADROOM,
+                 levels: Optional[list[QualityLevel]] = None):
+        self.enabled: bool = con.ADAPTIVE_QUALITY
+        self.budget_ms: float = budget_ms
+        self.headroom: float = headroom
+        self.levels: list[QualityLevel] = levels or QUALITY_LEVELS
+        self.index: int = 0
+        self.frame_ms: float = 0
+        self.samples: deque[float] = deque(maxlen=window)
+        self.good_windows: int = 0
+        self.upgrade_windows: int = 1
+        self.calm_windows: int = 0
+        # Direction of a level change made just before the current window,
+        # or 0.
+        self.last_change: int = 0
+        self.changes: int = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    def to_dict(self) -> dict:
+        return {
+            'level': self.index,
+            'frame_ms': round(self.frame_ms, 2),
+            'budget_ms': self.budget_ms,
+            'knobs': self.level.to_dict()
+        }
+
+    def set_level(self, index: int):
+        index = max(0, min(index, len(self.levels) - 1))
+        self.last_change = index - self.index
+        self.index = index
+        self.changes += 1
+        self.good_windows = 0
+        self.samples.clear()
+
+    def update(self, frame_ms: float) -> bool:
+        """Adds a frame time sample. Returns True if the level changed."""
+        if not self.enabled or frame_ms <= 0:
+            return False
+
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        self.frame_ms = median(self.samples)
+        self.samples.clear()
+        last_change, self.last_change = self.last_change, 0
+        if self.frame_ms > self.budget_ms:
+            self.calm_windows = 0
+            if self.index == len(self.levels) - 1:
+                return False
+
+            if last_change < 0:
+                self.upgrade_windows = min(self.upgrade_windows * 2,
+                                           self.MAX_UPGRADE_WINDOWS)
+            self.set_level(self.index + 1)
+            return True
+
+        self.calm_windows += 1
+        if self.calm_windows >= self.DECAY_WINDOWS:
+            self.calm_windows = 0
+            self.upgrade_windows = max(self.upgrade_windows // 2, 1)
+
+        if self.frame_ms < self.budget_ms * self.headroom and self.index > 0:
+            self.good_windows += 1
+            if self.good_windows >= self.upgrade_windows:
+                self.set_level(self.index - 1)
+                return True
+        else:
+            self.good_windows = 0
+        return False
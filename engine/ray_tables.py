@@ -0,0 +1,89 @@
+from functools import lru_cache
+import math
+
+from engine import constants as con
+from engine import ray_kernel
+
+np = ray_kernel.np
+
+
+class RayTables:
+    """Per-resolution lookup tables shared by the ray casters and sprites.
+
+    For every screen column this holds the ray's angle offset from the view
+    direction, the sine/cosine of that offset (so a frame's ray directions
+    are composed from the player's angle with two trig calls in total) and
+    the fishbowl correction factor. Projection heights are tabulated against
+    depth quantized to 1/PROJ_DEPTH_STEPS of a tile. One ray is cast per
+    `column_width` pixels of screen.
+    """
+
+    def __init__(self, width: int, height: int, column_width: int = con.SCALE):
+        self.width: int = width
+        self.height: int = height
+        self.num_rays: int = width // column_width
+        self.half_num_rays: int = self.num_rays // 2
+        self.scale: int = column_width
+        self.delta_angle: float = con.FOV / self.num_rays
+        self.inv_delta_angle: float = 1 / self.delta_angle
+        self.screen_dist: float = (width // 2) // math.tan(con.HALF_FOV)
+
+        self.angle_offsets: list[float] = [
+            -con.HALF_FOV + 0.0001 + ray * self.delta_angle
+            for ray in range(self.num_rays)
+        ]
+        self.sin_offsets: list[float] = [math.sin(a) for a in self.angle_offsets]
+        self.cos_offsets: list[float] = [math.cos(a) for a in self.angle_offsets]
+        # cos(player.angle - ray_angle) only depends on the column.
+        self.fishbowl: list[float] = self.cos_offsets
+
+        # Rays never travel further than MAX_DEPTH steps along each axis.
+        self.proj_steps: int = con.PROJ_DEPTH_STEPS
+        max_depth = int(con.MAX_DEPTH * math.sqrt(2)) + 1
+        self.proj_heights: list[float] = [
+            self.screen_dist / (i / self.proj_steps + 0.0001)
+            for i in range(max_depth * self.proj_steps)
+        ]
+
+        self.arrays = None
+        if np is not None:
+            self.arrays = _RayTableArrays(self)
+
+    def projection(self, depth: float) -> float:
+        i = int(depth * self.proj_steps)
+        if 0 <= i < len(self.proj_heights):
+            return self.proj_heights[i]
+        return self.screen_dist / (depth + 0.0001)
+
+    def column(self, delta: float) -> float:
+        """Fractional screen column of a direction `delta` off the view."""
+        return self.half_num_rays + delta * self.inv_delta_angle
+
+    def fishbowl_at(self, delta: float) -> float:
+        ray = int(self.column(delta))
+        if 0 <= ray < self.num_rays:
+            return self.fishbowl[ray]
+        return math.cos(delta)
+
+
+class _RayTableArrays:
+
+    def __init__(self, tables: RayTables):
+        self.angle_offsets = np.array(tables.angle_offsets)
+        self.sin_offsets = np.array(tables.sin_offsets)
+        self.cos_offsets = np.array(tables.cos_offsets)
+        self.fishbowl = self.cos_offsets
+        self.proj_heights = np.array(tables.proj_heights)
+
+    def ray_directions(self, angle: float):
+        sin_v = math.sin(angle)
+        cos_v = math.cos(angle)
+        sin_a = sin_v * self.cos_offsets + cos_v * self.sin_offsets
+        cos_a = cos_v * self.cos_offsets - sin_v * self.sin_offsets
+        return sin_a, cos_a
+
+
+@lru_cache(maxsize=8)
+def get_ray_tables(width: int, height: int,
+                   column_width: int = con.SCALE) -> RayTables:
+    return RayTables(width, height, column_width)
@@ -1,7 +1,12 @@
+import heapq
 from typing import Optional
 import pygame as pg
 import math
 from engine import constants as con
+from engine import ray_kernel
+from engine.depth_buffer import DepthBuffer
+from engine.ray_tables import RayTables
+from engine.sprite import Sprite
 
 
 class RayCaster:
@@ -9,46 +14,112 @@ class RayCaster:
     def __init__(self, game):
         self.game = game
         self.ray_casting_result: tuple[float, float, int, float | int] = ()
-        self.objects_to_render: list[tuple[float, pg.Surface,
+        # Sprites projected this frame: (depth, sprite, image, pos, size).
+        # They are only scaled once they turn out not to be hidden.
+        self.objects_to_render: list[tuple[float, Sprite, pg.Surface,
+                                           tuple[float, float],
                                            tuple[int, int]]] = []
         self.textures: Optional[dict] = self.game.object_renderer.wall_textures
+        self.use_numpy: bool = con.USE_NUMPY_RAYCASTER and ray_kernel.HAS_NUMPY
+        self.config = game.render_config
+        self.tables: RayTables = self.config.tables
+        self.depth_buffer: DepthBuffer = DepthBuffer(self.config.width,
+                                                     self.config.scale)
+        self.view_angle: float = 0
+        self.raw_depths = None
+        self.depths = None
+        self.proj_heights = None
+        self.texture_ids = None
+        self.texture_offsets = None
 
-    def refresh_objects_to_render(self):
-        self.objects_to_render = []
+        # Temporal coherence: what the last cast was made from, and how often
+        # each update path is taken.
+        self.cast_pos: Optional[tuple[float, float]] = None
+        self.cast_map_revision: int = -1
+        self.walls_changed: bool = True
+        # Scaled wall columns, used when not drawing into the frame buffer.
+        self.wall_objects: list[tuple[float, pg.Surface, tuple[int, int]]] = []
+        self.full_casts: int = 0
+        self.rotation_casts: int = 0
+        self.recast_columns: int = 0
+        self.reused_frames: int = 0
+
+        # Walls are rasterized straight into the object renderer's frame
+        # buffer, so there is no need to build per-column surfaces.
+        self.use_frame_buffer: bool = (
+            self.use_numpy and self.game.object_renderer.wall_renderer is not None)
+
+    def build_wall_column(self, texture: int, left: int,
+                          height: int) -> pg.Surface:
+        surface: pg.Surface = self.textures[texture]
+        scale = self.config.scale
+        screen_height = self.config.height
+        if height < screen_height:
+            wall_column = surface.subsurface(left, 0, scale,
+                                             con.TEXTURE_SIZE)
+            return pg.transform.scale(wall_column, (scale, height))
+
+        texture_height = con.TEXTURE_SIZE * screen_height / height
+        w_height = con.HALF_TEXTURE_SIZE - texture_height // 2
+        wall_column = surface.subsurface(left, w_height, scale,
+                                         texture_height)
+        return pg.transform.scale(wall_column, (scale, screen_height))
+
+    def refresh_wall_objects(self):
+        self.wall_objects = []
+        cache = self.game.object_renderer.column_cache
+        step = con.COLUMN_HEIGHT_STEP
+        scale = self.config.scale
         for ray, values in enumerate(self.ray_casting_result):
             depth, proj_height, texture, offset = values
-            surface: pg.Surface = self.textures[texture]
-            left_top = offset * (con.TEXTURE_SIZE - con.SCALE)
-            if proj_height < con.HEIGHT and self.textures:
-                wall_column = surface.subsurface(left_top, 0, con.SCALE,
-                                                 con.TEXTURE_SIZE)
-                wall_column = pg.transform.scale(wall_column,
-                                                 (con.SCALE, proj_height))
-                wall_pos = (ray * con.SCALE,
-                            con.HALF_HEIGHT - proj_height // 2)
+            left = int(offset * (con.TEXTURE_SIZE - scale))
+            height = int(proj_height) // step * step
+            key = (texture, left, height)
+            wall_column = cache.get(key)
+            if wall_column is None:
+                wall_column = self.build_wall_column(texture, left, height)
+                cache.put(key, wall_column)
+
+            if height < self.config.height and self.textures:
+                wall_pos = (ray * scale, self.config.half_height - height // 2)
             else:
-                texture_height = con.TEXTURE_SIZE * con.HEIGHT / proj_height
-                w_height = con.HALF_TEXTURE_SIZE - texture_height // 2
-                wall_column = surface.subsurface(left_top, w_height, con.SCALE,
-                                                 texture_height)
-                wall_column = pg.transform.scale(wall_column,
-                                                 (con.SCALE, con.HEIGHT))
-                wall_pos = (ray * con.SCALE, 0)
+                wall_pos = (ray * scale, 0)
 
             render = (depth, wall_column, wall_pos)
-            self.objects_to_render.append(render)
+            self.wall_objects.append(render)
 
-    def ray_cast(self):
-        self.ray_casting_result = []
+    def limit_sprites(self, max_sprites: int):
+        """Keeps only the nearest `max_sprites` sprites queued for drawing."""
+        if max_sprites and len(self.objects_to_render) > max_sprites:
+            self.objects_to_render = heapq.nsmallest(
+                max_sprites, self.objects_to_render, key=lambda t: t[0])
+
+    def cast_columns_numpy(self, view_angle: float, first: int, last: int):
+        player = self.game.player
+        sin_a, cos_a = self.tables.arrays.ray_directions(view_angle)
+        return ray_kernel.cast_rays(self.game.map.grid.walls,
+                                    player.view_pos, player.view_map_pos,
+                                    sin_a[first:last],
+                                    cos_a[first:last])
+
+    def cast_columns_python(self, view_angle: float, first: int, last: int):
+        raw_depths = []
+        texture_ids = []
+        texture_offsets = []
         texture_vert = 1
         texture_hor = 1
-        ox, oy = self.game.player.pos
-        x_map, y_map = self.game.player.map_pos
+        ox, oy = self.game.player.view_pos
+        x_map, y_map = self.game.player.view_map_pos
+        wall_at = self.game.map.grid.wall_at
+        tables = self.tables
+        sin_v = math.sin(view_angle)
+        cos_v = math.cos(view_angle)
 
-        ray_angle = self.game.player.angle - con.HALF_FOV + 0.0001
-        for ray in range(con.NUM_RAYS):
-            sin_a = math.sin(ray_angle)
-            cos_a = math.cos(ray_angle)
+        for ray in range(first, last):
+            sin_o = tables.sin_offsets[ray]
+            cos_o = tables.cos_offsets[ray]
+            sin_a = sin_v * cos_o + cos_v * sin_o
+            cos_a = cos_v * cos_o - sin_v * sin_o
 
             # Horizontals
             y_hor, dy = (y_map + 1, 1) if sin_a > 0 else (y_map - 1e-6, -1)
@@ -59,9 +130,9 @@ class RayCaster:
             dx = delta_depth * cos_a
 
             for i in range(con.MAX_DEPTH):
-                tile_hor = int(x_hor), int(y_hor)
-                if tile_hor in self.game.map.world_map:
-                    texture_hor = self.game.map.world_map[tile_hor]
+                tile_hor = wall_at(int(x_hor), int(y_hor))
+                if tile_hor:
+                    texture_hor = tile_hor
                     break
 
                 x_hor += dx
@@ -77,9 +148,9 @@ class RayCaster:
             dy = delta_depth * sin_a
 
             for i in range(con.MAX_DEPTH):
-                tile_vert = int(x_vert), int(y_vert)
-                if tile_vert in self.game.map.world_map:
-                    texture_vert = self.game.map.world_map[tile_vert]
+                tile_vert = wall_at(int(x_vert), int(y_vert))
+                if tile_vert:
+                    texture_vert = tile_vert
                     break
 
                 x_vert += dx
@@ -98,17 +169,126 @@ class RayCaster:
                 x_hor %= 1
                 offset = (1 - x_hor) if sin_a > 0 else x_hor
 
-            # Remove fishbowl effect
-            depth *= math.cos(self.game.player.angle - ray_angle)
+            raw_depths.append(depth)
+            texture_ids.append(texture)
+            texture_offsets.append(offset)
+
+        return raw_depths, texture_ids, texture_offsets
+
+    def cast_columns(self, view_angle: float, first: int, last: int):
+        """Casts the rays of screen columns [first, last).
+
+        Returns (depth, texture, offset) per ray, with depth measured along
+        the ray (before fishbowl correction).
+        """
+        if not self.use_numpy:
+            return self.cast_columns_python(view_angle, first, last)
+
+        pool = self.game.strip_pool
+        if pool is None or last - first < pool.workers:
+            return self.cast_columns_numpy(view_angle, first, last)
 
+        strips = pool.run(lambda start, end: self.cast_columns_numpy(
+            view_angle, first + start, first + end), last - first)
+        return tuple(ray_kernel.np.concatenate(parts) for parts in zip(*strips))
+
+    def project_columns(self):
+        tables = self.tables
+        if self.use_numpy:
+            arrays = tables.arrays
+            # Remove fishbowl effect
+            self.depths = self.raw_depths * arrays.fishbowl
             # Projection
-            proj_height = con.SCREEN_DIST / (depth + 0.0001)
+            self.proj_heights = ray_kernel.project(self.depths,
+                                                   arrays.proj_heights,
+                                                   tables.proj_steps,
+                                                   tables.screen_dist)
+            self.depth_buffer.set(self.depths)
+            if not self.use_frame_buffer:
+                result = (self.depths, self.proj_heights, self.texture_ids,
+                          self.texture_offsets)
+                self.ray_casting_result = list(
+                    zip(*(a.tolist() for a in result)))
+            return
+
+        self.depths = [depth * fishbowl for depth, fishbowl in
+                       zip(self.raw_depths, tables.fishbowl)]
+        self.depth_buffer.set(self.depths)
+        self.proj_heights = [tables.projection(depth) for depth in self.depths]
+        self.ray_casting_result = list(zip(self.depths, self.proj_heights,
+                                           self.texture_ids,
+                                           self.texture_offsets))
+
+    def ray_cast(self):
+        self.view_angle = self.game.player.view_angle
+        self.raw_depths, self.texture_ids, self.texture_offsets = \
+            self.cast_columns(self.view_angle, 0, self.tables.num_rays)
+        self.project_columns()
+
+    def rotate_columns(self, shift: int):
+        """Reuses the previous frame's rays after a pure rotation.
+
+        The view is turned by a whole number of columns, so every ray that is
+        still on screen keeps its result and only the `shift` newly exposed
+        columns are cast. `view_angle` can then be up to half a column off
+        the player's, so sprites are projected at `view_angle` too.
+        """
+        num_rays = self.tables.num_rays
+        self.view_angle = (self.view_angle +
+                           shift * self.tables.delta_angle) % math.tau
+        if shift > 0:
+            kept = slice(shift, num_rays)
+            fresh = self.cast_columns(self.view_angle, num_rays - shift,
+                                      num_rays)
+        else:
+            kept = slice(0, num_rays + shift)
+            fresh = self.cast_columns(self.view_angle, 0, -shift)
 
-            # Ray casting result
-            result = (depth, proj_height, texture, offset)
-            self.ray_casting_result.append(result)
-            ray_angle += con.DELTA_ANGLE
+        previous = (self.raw_depths, self.texture_ids, self.texture_offsets)
+        merged = []
+        for old, new in zip(previous, fresh):
+            parts = (old[kept], new) if shift > 0 else (new, old[kept])
+            if self.use_numpy:
+                merged.append(ray_kernel.np.concatenate(parts))
+            else:
+                merged.append(parts[0] + parts[1])
+
+        self.raw_depths, self.texture_ids, self.texture_offsets = merged
+        self.project_columns()
+
+    def check_coherence(self) -> Optional[int]:
+        """Compares the current view with the previous frame's.
+
+        Returns None if everything must be recast, 0 if the previous frame can
+        be reused as-is, or the number of columns the view has turned by.
+        """
+        player = self.game.player
+        if (not con.TEMPORAL_COHERENCE or self.raw_depths is None or
+                self.cast_pos != player.view_pos or
+                self.cast_map_revision != self.game.map.revision):
+            return None
+
+        turn = (player.view_angle - self.view_angle + math.pi) % math.tau - math.pi
+        shift = round(turn * self.tables.inv_delta_angle)
+        if abs(shift) >= self.tables.num_rays:
+            return None
+        return shift
 
     def update(self):
-        self.ray_cast()
-        self.refresh_objects_to_render()
+        shift = self.check_coherence()
+        self.walls_changed = shift != 0
+        if shift is None:
+            self.full_casts += 1
+            self.ray_cast()
+            self.cast_pos = self.game.player.view_pos
+            self.cast_map_revision = self.game.map.revision
+        elif shift:
+            self.rotation_casts += 1
+            self.recast_columns += abs(shift)
+            self.rotate_columns(shift)
+        else:
+            self.reused_frames += 1
+
+        self.objects_to_render = []
+        if self.walls_changed and not self.use_frame_buffer:
+            self.refresh_wall_objects()
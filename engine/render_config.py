@@ -0,0 +1,77 @@
+from engine import constants as con
+from engine.ray_tables import RayTables
+from engine.ray_tables import get_ray_tables
+
+
+class RenderConfig:
+    """Resolution the game world is rendered at.
+
+    The renderer draws into a `width` x `height` surface, which is scaled up
+    to the `window_width` x `window_height` display when the frame is
+    presented. The ray caster, sprites, weapon and HUD take their layout from
+    here rather than from the resolution constants, so rendering at a lower
+    internal resolution only costs the final scale.
+    """
+
+    def __init__(self,
+                 width: int = con.WIDTH,
+                 height: int = con.HEIGHT,
+                 window_width: int = 0,
+                 window_height: int = 0,
+                 column_width: int = con.SCALE):
+        self.width: int = width
+        self.height: int = height
+        self.window_width: int = window_width or width
+        self.window_height: int = window_height or height
+        self.half_width: int = width // 2
+        self.half_height: int = height // 2
+        self.tables: RayTables = get_ray_tables(width, height, column_width)
+        self.num_rays: int = self.tables.num_rays
+        self.half_num_rays: int = self.tables.half_num_rays
+        self.scale: int = self.tables.scale
+        self.delta_angle: float = self.tables.delta_angle
+        self.screen_dist: float = self.tables.screen_dist
+
+    def __eq__(self, other):
+        return (isinstance(other, RenderConfig) and
+                other.res == self.res and
+                other.window_res == self.window_res and
+                other.scale == self.scale)
+
+    def __hash__(self):
+        return hash((self.res, self.window_res, self.scale))
+
+    @property
+    def res(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def window_res(self) -> tuple[int, int]:
+        return self.window_width, self.window_height
+
+    @property
+    def is_scaled(self) -> bool:
+        return self.res != self.window_res
+
+    @property
+    def ui_scale(self) -> float:
+        # HUD fonts and weapon sprites are sized for the default height.
+        return self.height / con.HEIGHT
+
+    def with_column_width(self, column_width: int):
+        return RenderConfig(self.width, self.height, self.window_width,
+                            self.window_height, column_width)
+
+    @staticmethod
+    def for_window(window: tuple[int, int],
+                   render: tuple[int, int] = (0, 0),
+                   column_width: int = con.SCALE):
+        # A zero render size means "same as the window". The internal
+        # resolution is never larger than the window, and is scaled down as a
+        # whole so it keeps its aspect ratio.
+        width = render[0] or window[0]
+        height = render[1] or window[1]
+        factor = min(1, window[0] / width, window[1] / height)
+        return RenderConfig(max(1, int(width * factor)),
+                            max(1, int(height * factor)), window[0], window[1],
+                            column_width)
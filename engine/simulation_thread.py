@@ -0,0 +1,58 @@
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Callable, Optional
+
+
+class SimulationThread:
+    """Runs simulation ticks on a worker thread while the main thread draws
+    the last snapshot; `defer()` hands display work back to the main thread."""
+
+    def __init__(self, game):
+        self.game = game
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='simulation')
+        self.future: Optional[Future] = None
+        self.thread_id: Optional[int] = None
+        self.deferred: list[Callable[[], None]] = []
+        # How long the last batch of ticks took, in milliseconds.
+        self.busy_ms: float = 0
+
+    def in_worker(self) -> bool:
+        return threading.get_ident() == self.thread_id
+
+    def _run(self, ticks: int):
+        self.thread_id = threading.get_ident()
+        start = time.perf_counter()
+        self.game.run_ticks(ticks, False)
+        self.busy_ms = (time.perf_counter() - start) * 1000
+
+    def start(self, ticks: int):
+        if ticks:
+            self.future = self.executor.submit(self._run, ticks)
+
+    def wait(self):
+        """Blocks until the running batch is done, then runs whatever it
+        deferred."""
+        if self.future is not None:
+            future, self.future = self.future, None
+            future.result()
+
+        deferred, self.deferred = self.deferred, []
+        for func in deferred:
+            func()
+
+    def defer(self, func: Callable[[], None]) -> bool:
+        """Queues `func` if called from a tick, returning whether it was.
+        The same callable is only queued once per batch."""
+        if not self.in_worker():
+            return False
+
+        if func not in self.deferred:
+            self.deferred.append(func)
+        return True
+
+    def shutdown(self):
+        self.wait()
+        self.executor.shutdown(wait=True)
@@ -3,7 +3,6 @@ from collections import deque
 import os
 import pygame as pg
 from typing import Optional
-from engine import constants as con
 from engine.player import Player
 
 
@@ -20,6 +19,9 @@ class Sprite(pg.sprite.Sprite):
         self.player: Player = game.player
         self.x: float = pos[0]
         self.y: float = pos[1]
+        # Position at the start of the current simulation tick.
+        self.prev_x: float = self.x
+        self.prev_y: float = self.y
         self.image: Optional[pg.Surface] = None
         self.dx: float = 0
         self.dy: float = 0
@@ -38,6 +40,8 @@ class Sprite(pg.sprite.Sprite):
         self.interaction_sound: Optional[pg.mixer.Sound] = None
         self.removed: bool = False
         self.rect: Optional[pg.Rect] = None
+        self._scaled_source: Optional[pg.Surface] = None
+        self._scaled_image: Optional[pg.Surface] = None
 
         if os.path.exists(path):
             self.image = pg.image.load(path).convert_alpha()
@@ -48,44 +52,93 @@ class Sprite(pg.sprite.Sprite):
         if self.image is not None:
             self.rect = self.image.get_rect()
 
+    def projected_size(self, width: float, height: float) -> tuple[int, int]:
+        # Sizes are rounded down to the quality level's step.
+        step = self.game.quality.level.sprite_size_step
+        return int(width) // step * step, int(height) // step * step
+
+    def scale_image(self, image: pg.Surface,
+                    size: tuple[int, int]) -> pg.Surface:
+        # The last scaled image is reused until the frame or size changes.
+        if (self._scaled_source is not image or
+                self._scaled_image.get_size() != size):
+            self._scaled_source = image
+            self._scaled_image = pg.transform.scale(image, size)
+        return self._scaled_image
+
+    def view_radius(self) -> float:
+        # Half the width of the sprite in world units.
+        return self.IMAGE_RATIO * self.SPRITE_SCALE / 2
+
+    def projection_size(self, norm_dist: float) -> tuple[int, int]:
+        proj = self.game.ray_caster.tables.projection(norm_dist) * \
+            self.SPRITE_SCALE
+        return self.projected_size(proj * self.IMAGE_RATIO, proj)
+
+    def draw_entry(self, image: pg.Surface, screen_x: float,
+                   norm_dist: float) -> tuple:
+        """The (depth, sprite, image, pos, size) tuple the renderer draws
+        `image` from. Doesn't change the sprite."""
+        size = self.projection_size(norm_dist)
+        proj_width, proj_height = size
+        height_shift = proj_height * self.SPRITE_HEIGHT_SHIFT
+        w = screen_x - proj_width // 2
+        h = self.game.render_config.half_height - proj_height // 2 + \
+            height_shift
+        return norm_dist, self, image, (w, h), size
+
     def get_sprite_projection(self):
         if not self.image:
             return
 
-        proj = con.SCREEN_DIST / self.norm_dist * self.SPRITE_SCALE
-        proj_width = proj * self.IMAGE_RATIO
-        proj_height = proj
+        entry = self.draw_entry(self.image, self.screen_x, self.norm_dist)
+        self.sprite_half_width = entry[4][0] // 2
+        self.game.ray_caster.objects_to_render.append(entry)
 
-        image = pg.transform.scale(self.image, (proj_width, proj_height))
-
-        self.sprite_half_width = proj_width // 2
-        height_shift = proj_height * self.SPRITE_HEIGHT_SHIFT
-        w = self.screen_x - self.sprite_half_width
-        h = con.HALF_HEIGHT - proj_height // 2 + height_shift
-        pos = w, h
+    def save_pos(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
 
-        self.game.ray_caster.objects_to_render.append(
-            (self.norm_dist, image, pos))
+    def locate(self, x: float, y: float, px: float, py: float,
+               angle: float) -> tuple[float, ...]:
+        """(dx, dy, theta, screen_x, dist, norm_dist) of the sprite at
+        (x, y) as seen from (px, py) facing `angle`."""
+        dx = x - px
+        dy = y - py
+        theta = math.atan2(dy, dx)
 
-    def refresh_sprite(self):
-        dx = self.x - self.player.x
-        dy = self.y - self.player.y
-        self.dx = dx
-        self.dy = dy
-        self.theta = math.atan2(dy, dx)
-
-        delta = self.theta - self.player.angle
-        if (dx > 0 and self.player.angle > math.pi) or (dx < 0 and dy < 0):
+        delta = theta - angle
+        if (dx > 0 and angle > math.pi) or (dx < 0 and dy < 0):
             delta += math.tau
 
-        delta_rays = delta / con.DELTA_ANGLE
-        self.screen_x = (con.HALF_NUM_RAYS + delta_rays) * con.SCALE
+        tables = self.game.ray_caster.tables
+        screen_x = tables.column(delta) * tables.scale
+        dist = math.hypot(dx, dy)
+        return dx, dy, theta, screen_x, dist, dist * tables.fishbowl_at(delta)
+
+    def on_screen(self, x: float, y: float, screen_x: float,
+                  norm_dist: float, visible: Optional[int] = None) -> bool:
+        total_width = self.game.render_config.width + self.IMAGE_HALF_WIDTH
+        acceptable_width = -self.IMAGE_HALF_WIDTH < screen_x < total_width
+        return (acceptable_width and norm_dist > 0.5 and
+                self.game.object_handler.can_see(x, y, self.view_radius(),
+                                                 visible))
 
-        self.dist = math.hypot(dx, dy)
-        self.norm_dist = self.dist * math.cos(delta)
-        total_width = con.WIDTH + self.IMAGE_HALF_WIDTH
-        acceptable_width = -self.IMAGE_HALF_WIDTH < self.screen_x < total_width
-        if acceptable_width and self.norm_dist > 0.5:
+    def refresh_sprite(self):
+        player = self.player
+        # Frames are drawn at the angle the walls were cast at (see
+        # ObjectHandler.project()).
+        angle = (player.angle if self.game.fixed_timestep else
+                 self.game.ray_caster.view_angle)
+        (self.dx, self.dy, self.theta, self.screen_x, self.dist,
+         self.norm_dist) = self.locate(self.x, self.y, player.x, player.y,
+                                       angle)
+        # With a fixed timestep, this only runs in simulation ticks, which
+        # just need the distance. Frames are drawn from the world snapshot
+        # instead (see ObjectHandler.project()).
+        if (not self.game.fixed_timestep and
+                self.on_screen(self.x, self.y, self.screen_x,
+                               self.norm_dist)):
             self.get_sprite_projection()
 
     def interact(self):
@@ -0,0 +1,143 @@
+import pygame as pg
+from collections import deque
+from typing import Optional
+
+from engine import constants as con
+from engine.glyph_atlas import GlyphAtlas
+
+
+# Bar colors in stacking order (bottom first). Stages not listed here are
+# drawn gray on top.
+STAGE_COLORS: dict[str, tuple[int, int, int]] = {
+    'sync': (255, 255, 120),
+    'input': (120, 120, 255),
+    'player': (0, 200, 200),
+    'ray_cast': (255, 200, 0),
+    'objects': (0, 200, 0),
+    'weapon': (200, 100, 255),
+    'hud': (255, 120, 200),
+    'render': (255, 80, 0),
+    'weapon_draw': (150, 60, 0),
+    'present': (200, 200, 200),
+}
+OTHER_COLOR = (110, 110, 110)
+
+
+class StageOverlay:
+    """On-screen graph of where the frame time goes.
+
+    Every frame adds one column of stacked bars, one per stage timed by the
+    game's StageTimer, to a graph that scrolls left and covers the last
+    STAGE_OVERLAY_FRAMES frames. The horizontal line is the frame budget.
+    A legend lists each stage's average over the same window. Only the new
+    column is drawn each frame and the legend is re-rendered a few times a
+    second, so the overlay stays cheap; when it's hidden, nothing is
+    collected or drawn at all.
+    """
+
+    LEGEND_INTERVAL = 15
+    BACKGROUND = (20, 20, 20)
+
+    def __init__(self, game):
+        self.game = game
+        self.enabled: bool = con.SHOW_STAGE_OVERLAY
+        self.history: deque[dict[str, float]] = deque(
+            maxlen=con.STAGE_OVERLAY_FRAMES)
+        self.graph: Optional[pg.Surface] = None
+        self.legend: Optional[pg.Surface] = None
+        self.atlas: Optional[GlyphAtlas] = None
+        self.bar_width: int = 1
+        self.ms_height: float = 1
+        self.frames_since_legend: int = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        # Also called when the render resolution changes.
+        self.history.clear()
+        self.graph = None
+        self.legend = None
+
+    def _setup(self):
+        ui_scale = self.game.render_config.ui_scale
+        self.bar_width = max(int(3 * ui_scale), 1)
+        width = self.bar_width * self.history.maxlen
+        height = max(int(200 * ui_scale), 40)
+        # The graph tops out at twice the frame budget.
+        self.ms_height = height / (con.FRAME_BUDGET_MS * 2)
+        self.graph = pg.Surface((width, height)).convert()
+        self.graph.fill(self.BACKGROUND)
+        self.graph.set_alpha(210)
+        self.atlas = GlyphAtlas.get('DUGAFONT.ttf', max(int(20 * ui_scale), 8))
+        self.legend = None
+
+    def _add_bar(self, stages: dict[str, float]):
+        graph = self.graph
+        width, height = graph.get_size()
+        x = width - self.bar_width
+        graph.scroll(-self.bar_width, 0)
+        graph.fill(self.BACKGROUND, (x, 0, self.bar_width, height))
+
+        bottom = float(height)
+        for stage, ms in self._ordered(stages):
+            top = bottom - ms * self.ms_height
+            if ms > 0 and bottom > 0:
+                graph.fill(STAGE_COLORS.get(stage, OTHER_COLOR),
+                           (x, int(top), self.bar_width,
+                            int(bottom) - int(top) or 1))
+            bottom = top
+
+        budget_y = int(height - con.FRAME_BUDGET_MS * self.ms_height)
+        pg.draw.line(graph, (255, 255, 255), (0, budget_y),
+                     (width, budget_y))
+
+    @staticmethod
+    def _ordered(stages: dict[str, float]) -> list[tuple[str, float]]:
+        known = [(stage, stages[stage]) for stage in STAGE_COLORS
+                 if stage in stages]
+        return known + [(stage, ms) for stage, ms in stages.items()
+                        if stage not in STAGE_COLORS]
+
+    def _render_legend(self):
+        totals: dict[str, float] = {}
+        for stages in self.history:
+            for stage, ms in stages.items():
+                totals[stage] = totals.get(stage, 0) + ms
+        count = len(self.history)
+        averages = [(stage, total / count)
+                    for stage, total in self._ordered(totals)]
+        frame_ms = sum(ms for _, ms in averages)
+
+        lines = [(f'frame {frame_ms:5.2f} ms', (255, 255, 255))]
+        lines += [(f'{stage} {ms:5.2f}', STAGE_COLORS.get(stage, OTHER_COLOR))
+                  for stage, ms in averages]
+        atlas = self.atlas
+        width = max(atlas.size(text)[0] for text, _ in lines) + 8
+        height = atlas.height * len(lines) + 8
+        self.legend = pg.Surface((width, height)).convert()
+        self.legend.fill(self.BACKGROUND)
+        self.legend.set_alpha(210)
+        for i, (text, color) in enumerate(lines):
+            atlas.draw(self.legend, text, (4, 4 + i * atlas.height), color)
+
+    def draw(self):
+        stages = self.game.stage_timer.stages
+        if not stages:
+            return
+
+        if self.graph is None:
+            self._setup()
+        self.history.append(stages)
+        self._add_bar(stages)
+        self.frames_since_legend += 1
+        if (self.legend is None or
+                self.frames_since_legend >= self.LEGEND_INTERVAL):
+            self._render_legend()
+            self.frames_since_legend = 0
+
+        screen = self.game.screen
+        x = screen.get_width() - self.graph.get_width()
+        screen.blit(self.graph, (x, 0))
+        screen.blit(self.legend, (x - self.legend.get_width(), 0))
@@ -0,0 +1,39 @@
+import time
+
+
+class StageTimer:
+    """Measures how long each stage of a frame takes.
+
+    Call `begin_frame()` at the start of a frame, `mark(stage)` at the end
+    of every stage and `end_frame()` once it's done; each mark is charged the
+    time since the previous one. `stages` then holds the completed frame's
+    milliseconds per stage and `frame_ms` their total, until the next frame
+    ends. Frames that are begun but never ended (while paused, etc) are
+    dropped.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.frame_ms: float = 0
+        self._current: dict[str, float] = {}
+        self._last: float = time.perf_counter()
+
+    def begin_frame(self):
+        self._current = {}
+        self._last = time.perf_counter()
+
+    def end_frame(self):
+        self.stages = self._current
+        self.frame_ms = sum(self._current.values())
+        self._current = {}
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000
+        self._current[stage] = self._current.get(stage, 0) + elapsed
+        self._last = now
+
+    def skip(self):
+        # Time since the last mark (frame limiter waits, etc) is not charged
+        # to any stage.
+        self._last = time.perf_counter()
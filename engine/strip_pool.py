@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class StripPool:
+    """Thread pool that processes vertical screen strips in parallel.
+
+    Columns are split into one contiguous strip per worker. Results are
+    always collected in strip order, so merging them is deterministic and
+    matches processing the whole screen in one go.
+    """
+
+    def __init__(self, workers: int):
+        self.workers: int = workers
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='render_strip')
+
+    def strips(self, count: int) -> list[tuple[int, int]]:
+        bounds = [count * i // self.workers for i in range(self.workers + 1)]
+        return [(first, last) for first, last in zip(bounds, bounds[1:])
+                if first < last]
+
+    def run(self, func: Callable[[int, int], Any], count: int) -> list[Any]:
+        futures = [self.executor.submit(func, first, last)
+                   for first, last in self.strips(count)]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -1,11 +1,17 @@
-import os
 import pygame as pg
+from typing import Optional
 
-from engine import constants as con
 from engine import RGBColors
+from engine.glyph_atlas import GlyphAtlas
 
 
 class Text:
+    """A line of text in one of the game's fonts.
+
+    Text is drawn glyph by glyph from the GlyphAtlas for its font and size,
+    which every Text of that font and size shares, so changing the string
+    never rasterizes anything.
+    """
 
     def __init__(self, game, pos: tuple[float, float], string: str,
                  color: RGBColors, font_name: str, size: int):
@@ -14,17 +20,24 @@ class Text:
         self.string: str = string
         self.color: RGBColors = color
         self.size: int = size
-        font_path = os.path.join(con.FONT_BASE, font_name)
-        self.font: pg.font.Font = pg.font.Font(font_path, self.size)
-        self.layout: pg.Surface = self.font.render(self.string, True,
-                                                   self.color.value)
+        self.atlas: GlyphAtlas = GlyphAtlas.get(font_name, size)
+
+    def draw(self, surface: Optional[pg.Surface] = None,
+             pos: Optional[tuple[float, float]] = None):
+        """Draws on the screen at `pos` unless told otherwise."""
+        if surface is None:
+            surface = self.game.screen
+        if pos is None:
+            pos = self.pos
+        self.atlas.draw(surface, self.string, pos, self.color.value)
 
-    def draw(self):
-        self.game.screen.blit(self.layout, self.pos)
+    def update_text(self, string: str) -> bool:
+        """Returns whether the string changed."""
+        if string == self.string:
+            return False
 
-    def update_text(self, string: str):
         self.string = string
-        self.layout = self.font.render(self.string, True, self.color.value)
+        return True
 
     def update_pos(self, pos: tuple[float, float]):
         self.pos = pos
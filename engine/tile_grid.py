@@ -0,0 +1,87 @@
+from array import array
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TileGrid:
+    """Dense, row-major tile storage for a map.
+
+    Each tile holds a wall texture id (0 = no wall) and a set of bit flags.
+    Scalar queries are O(1) index lookups. When NumPy is available, `walls`
+    and `flags` expose zero-copy (rows, cols) array views of the same memory
+    for bulk access, indexed as [y, x] to match the mini map.
+    """
+
+    OBSTACLE = 1
+    DOOR = 2
+    PICKUP = 4
+
+    def __init__(self, rows: int, cols: int):
+        self.rows: int = rows
+        self.cols: int = cols
+        self._walls: array = array('H', bytes(2 * rows * cols))
+        self._flags: bytearray = bytearray(rows * cols)
+        self.walls = None
+        self.flags = None
+        if np is not None:
+            self.walls = np.frombuffer(self._walls, dtype=np.uint16)\
+                .reshape(rows, cols)
+            self.flags = np.frombuffer(self._flags, dtype=np.uint8)\
+                .reshape(rows, cols)
+
+    @staticmethod
+    def from_mini_map(mini_map: list[list[int] | list[int | bool]]):
+        rows = len(mini_map)
+        cols = max((len(row) for row in mini_map), default=0)
+        grid = TileGrid(rows, cols)
+        for y, row in enumerate(mini_map):
+            for x, value in enumerate(row):
+                if value:
+                    grid._walls[y * cols + x] = int(value)
+        return grid
+
+    def index(self, x: int, y: int) -> Optional[int]:
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return None
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def wall_at(self, x: int, y: int) -> int:
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self._walls[y * self.cols + x]
+        return 0
+
+    def is_wall(self, x: int, y: int) -> bool:
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self._walls[y * self.cols + x] != 0
+        return False
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        # Walls and obstacles (closed doors, etc) both block movement and
+        # line of sight.
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            i = y * self.cols + x
+            return (self._walls[i] != 0 or
+                    (self._flags[i] & TileGrid.OBSTACLE) != 0)
+        return False
+
+    def has_flag(self, x: int, y: int, flag: int) -> bool:
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return (self._flags[y * self.cols + x] & flag) != 0
+        return False
+
+    def set_flag(self, x: int, y: int, flag: int):
+        i = self.index(x, y)
+        if i is not None:
+            self._flags[i] |= flag
+
+    def clear_flag(self, x: int, y: int, flag: int):
+        i = self.index(x, y)
+        if i is not None:
+            self._flags[i] &= ~flag & 0xFF
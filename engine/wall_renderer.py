@@ -0,0 +1,101 @@
+import pygame as pg
+from typing import Optional
+
+from engine import constants as con
+from engine import ray_kernel
+from engine.strip_pool import StripPool
+
+np = ray_kernel.np
+
+
+class WallRenderer:
+    """Rasterizes every wall column of a frame into one preallocated buffer.
+
+    Wall textures are kept as a single (y, texture id, x) array of mapped
+    pixels, with an extra row holding the transparent color key. Each frame,
+    the columns described by the ray caster's arrays are sampled straight into
+    the pixels of `frame`. Pixels above and below the walls get the color key,
+    so the frame is presented over the background with a single blit instead
+    of one scaled Surface per column.
+    """
+
+    # Projected heights are clamped so the 16.16 fixed point texture step
+    # cannot overflow.
+    MIN_PROJ_HEIGHT = 16
+
+    def __init__(self, game):
+        self.game = game
+        self.config = game.render_config
+        self.max_proj_height: int = self.config.height * 64
+        self.frame: pg.Surface = pg.Surface(self.config.res).convert()
+        self.color_key: int = self.frame.map_rgb(con.FRAME_COLOR_KEY)
+        self.frame.set_colorkey(con.FRAME_COLOR_KEY)
+        self.texture_stack = None
+        self.screen_rows = np.arange(self.config.height,
+                                     dtype=np.int32)[:, None]
+        self.ray_index = np.arange(self.config.num_rays, dtype=np.uint32)
+
+    def setup(self, wall_textures: Optional[dict[int, pg.Surface]]):
+        if not wall_textures:
+            self.texture_stack = None
+            return
+
+        size = con.TEXTURE_SIZE
+        stack = np.full((size + 1, max(wall_textures) + 1, size),
+                        self.color_key, dtype=np.uint32)
+        for tex_id, texture in wall_textures.items():
+            if texture is not None:
+                texels = pg.surfarray.array2d(texture.convert(self.frame))
+                stack[:size, tex_id] = texels.T
+
+        # Keep opaque texels from colliding with the color key.
+        stack[:size][stack[:size] == self.color_key] ^= 1
+        self.texture_stack = stack
+
+    def draw_wall_strip(self, pixels, proj_heights, texture_ids,
+                        texture_offsets, first: int, last: int):
+        """Rasterizes the columns of rays [first, last) into `pixels`.
+
+        Only the strip's own pixel columns are written, so strips can be
+        drawn concurrently.
+        """
+        size = con.TEXTURE_SIZE
+        scale = self.config.scale
+        count = last - first
+        proj_heights = np.clip(proj_heights[first:last], self.MIN_PROJ_HEIGHT,
+                               self.max_proj_height)
+        top = (self.config.half_height - proj_heights // 2).astype(np.int32)
+        step = (size * 65536 / proj_heights).astype(np.int32)
+
+        # (screen row, ray) -> texture row, with everything outside the wall
+        # (negative rows wrap around as unsigned) mapped to the color key row.
+        tex_y = self.screen_rows - top
+        tex_y *= step
+        tex_y >>= 16
+        tex_y = tex_y.view(np.uint32)
+        np.minimum(tex_y, size, out=tex_y)
+        tex_y *= count
+        tex_y += self.ray_index[:count]
+
+        tex_ids = texture_ids[first:last].astype(np.intp)
+        left = (texture_offsets[first:last] * (size - scale)).astype(np.intp)
+
+        strip = pixels[:, first * scale:last * scale]
+        for sub_column in range(scale):
+            columns = self.texture_stack[:, tex_ids, left + sub_column]
+            strip[:, sub_column::scale] = np.take(columns.ravel(), tex_y)
+
+    def draw_walls(self, proj_heights, texture_ids, texture_offsets,
+                   pool: Optional[StripPool] = None):
+        if self.texture_stack is None or proj_heights is None:
+            return
+
+        pixels = pg.surfarray.pixels2d(self.frame).T
+        if pool is None:
+            self.draw_wall_strip(pixels, proj_heights, texture_ids,
+                                 texture_offsets, 0, len(proj_heights))
+        else:
+            pool.run(lambda first, last: self.draw_wall_strip(
+                pixels, proj_heights, texture_ids, texture_offsets,
+                first, last), len(proj_heights))
+        del pixels
@@ -2,7 +2,6 @@ from collections import deque
 import pygame as pg
 from typing import Optional
 
-from engine import constants as con
 from engine.sprite import AnimatedSprite
 
 
@@ -58,8 +57,10 @@ class Weapon(AnimatedSprite):
             self.ammo_remaining = -1
 
         if self.image:
-            s_w = self.image.get_width() * self.SPRITE_SCALE
-            s_h = self.image.get_height() * self.SPRITE_SCALE
+            config = self.game.render_config
+            scale = self.SPRITE_SCALE * config.ui_scale
+            s_w = self.image.get_width() * scale
+            s_h = self.image.get_height() * scale
             self.images = deque([
                 pg.transform.smoothscale(img, (s_w, s_h))
                 for img in self.images
@@ -68,8 +69,8 @@ class Weapon(AnimatedSprite):
             self._original_images = self.images
             self.num_images = len(self.images)
 
-            i_w = con.HALF_WIDTH - self.images[0].get_width() // 2
-            i_h = con.HEIGHT - self.images[0].get_height()
+            i_w = config.half_width - self.images[0].get_width() // 2
+            i_h = config.height - self.images[0].get_height()
             self.weapon_pos = (i_w, i_h)
 
             if len(self.reload_anim_images):
@@ -138,8 +139,11 @@ class Weapon(AnimatedSprite):
                     self.frame_counter = 0
                     self._spindown_complete = True
 
-    def draw(self):
-        self.game.screen.blit(self.images[0], self.weapon_pos)
+    def draw(self, image: Optional[pg.Surface] = None):
+        # `image` is the frame captured in the world snapshot, if any.
+        if image is None:
+            image = self.images[0]
+        self.game.screen.blit(image, self.weapon_pos)
 
     def update(self):
         self.check_animation_time()
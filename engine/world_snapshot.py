@@ -0,0 +1,45 @@
+import math
+import pygame as pg
+from typing import Optional
+
+
+class WorldSnapshot:
+    """Everything a frame is drawn from, copied from the simulation between
+    ticks so the next tick can run while it's drawn."""
+
+    def __init__(self):
+        self.player_prev: tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self.player_pose: tuple[float, float, float] = (0.0, 0.0, 0.0)
+        # (sprite, prev_x, prev_y, x, y, image)
+        self.sprites: list[tuple] = []
+        self.weapon_image: Optional[pg.Surface] = None
+
+    def capture(self, game):
+        # Must not run while a tick does.
+        player = game.player
+        self.player_prev = (player.prev_x, player.prev_y, player.prev_angle)
+        self.player_pose = (player.x, player.y, player.angle)
+
+        handler = game.object_handler
+        sprites = [(sprite, sprite.prev_x, sprite.prev_y, sprite.x, sprite.y,
+                    sprite.image)
+                   for sprite in handler.sprite_list if not sprite.removed]
+        sprites += [(npc, npc.prev_x, npc.prev_y, npc.x, npc.y, npc.image)
+                    for npc in handler.enemy_list]
+        self.sprites = sprites
+
+        weapon = game.current_weapon
+        self.weapon_image = weapon.images[0] if weapon and weapon.images \
+            else None
+
+    def view_pose(self, alpha: float) -> tuple[float, float, float]:
+        """The player's pose `alpha` (0..1) of the way from the previous
+        tick's to the current one, turning the short way round."""
+        x0, y0, a0 = self.player_prev
+        x1, y1, a1 = self.player_pose
+        if alpha >= 1:
+            return x1, y1, a1 % math.tau
+
+        turn = (a1 - a0 + math.pi) % math.tau - math.pi
+        return (x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha,
+                (a0 + turn * alpha) % math.tau)
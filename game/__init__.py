@@ -50,6 +50,15 @@ def run_doom_wolf(window_title: str = 'DoomWolf'):
     dw.run()
 
 
+def run_headless(frames: int, window_title: str = 'DoomWolf'):
+    # Plays the default maps without a display or any input, for soak tests
+    # and benchmarks on machines without a screen.
+    dw = DoomWolf(window_title, GameSettings(SETTINGS), headless=True)
+    dw.find_maps()
+    dw.new_game()
+    dw.run(frames)
+
+
 def test_map(map_path: str):
     if not os.path.isabs(map_path):
         print(f'ERROR: {map_path} is not an absolute path.')
@@ -57,7 +57,7 @@ class DoomWolfObjectHandler(ObjectHandler):
                 self.add_sprite(d_sprite)
                 for i in range(d_sprite.tile_count):
                     pos = (int(d_sprite.x - i), int(d_sprite.y))
-                    self.game.map.add_obstacle(pos)
+                    self.game.map.add_obstacle(pos, door=True)
 
             for i_sprite in self.sprite_map.item_sprites:
                 self.add_sprite(i_sprite)
@@ -7,6 +7,7 @@ from engine import constants as con
 from engine import Resolution
 from engine.game import Game
 from engine.input_handler import InputEvent
+from engine.render_config import RenderConfig
 from game.doom_obj_handler import DoomWolfObjectHandler
 from game.settings import GameSettings
 from maps import game_map
@@ -22,8 +23,9 @@ SETTINGS = 'settings.json'
 class DoomWolf(Game):
 
     def __init__(self, window_title: str = 'DoomWolf',
-                 settings: Optional[GameSettings] = None):
-        super().__init__()
+                 settings: Optional[GameSettings] = None,
+                 headless: bool = False):
+        super().__init__(headless)
         self.window_title = window_title
         if settings is None:
             settings = GameSettings(SETTINGS)
@@ -49,11 +51,16 @@ class DoomWolf(Game):
         self.input.joy_d_pad_y_axis = self.settings.joy_d_pad_y_axis
 
         self.sound.set_music_volume(self.settings.music_volume)
+        window_res = self.window.get_size()
         if self.settings.resolution != Resolution.zero():
-            res = self.settings.resolution.to_tuple()
-            self.screen = pg.display.set_mode(res, pg.HWSURFACE)
-
-        if self.settings.launch_fullscreen and not pg.display.is_fullscreen():
+            window_res = self.settings.resolution.to_tuple()
+        render_res = self.settings.render_resolution.to_tuple()
+        column_width = self.quality.level.column_width
+        self.set_render_config(RenderConfig.for_window(window_res, render_res,
+                                                       column_width))
+
+        if (self.settings.launch_fullscreen and not self.headless and
+                not pg.display.is_fullscreen()):
             pg.display.toggle_fullscreen()
 
     def _add_pause_screen(self):
@@ -177,6 +184,11 @@ class DoomWolf(Game):
             self.player.angle = player_data['angle']
             self.player.rel = player_data['rel']
 
+        # Nothing should appear to move from where it was before loading.
+        self.player.save_pose()
+        self.player.set_view(*self.player.pose)
+        self.object_handler.save_positions()
+
         self.weapon_inventory.load_weapons()
         if weapon_data:
             self.weapon_inventory.current_weapon = weapon_data['current']
@@ -13,6 +13,8 @@ class GameSettings:
         self.music_volume: float = 0.4
         self.launch_fullscreen: bool = False
         self.resolution: Resolution = Resolution.default()
+        # Zero renders at the window resolution.
+        self.render_resolution: Resolution = Resolution.zero()
         self.monitor_id: int = 0
         self.mouse_sensitivity: float = con.MOUSE_SENSITIVITY
         self.mouse_fire_button: int = 1
@@ -36,6 +38,10 @@ class GameSettings:
                 "width": self.resolution.width,
                 "height": self.resolution.height
             },
+            'render_resolution': {
+                "width": self.render_resolution.width,
+                "height": self.render_resolution.height
+            },
             'input': {
                 'mouse': {
                     'sensitivity': self.mouse_sensitivity,
@@ -73,6 +79,10 @@ class GameSettings:
                 if res:
                     self.resolution = Resolution.from_dict(res)
 
+                render_res = settings.get('render_resolution')
+                if render_res:
+                    self.render_resolution = Resolution.from_dict(render_res)
+
                 monitor_id = settings.get('monitor_id', 0)
                 if monitor_id:
                     self.monitor_id = monitor_id
@@ -23,12 +23,28 @@ def test_the_map(map_path: str):
 @click.version_option(VERSION, prog_name='DoomWolf')
 @click.option('--test_map', required=False, type=click.Path(),
               help='Test the specified map.')
-def main(test_map):
+@click.option('--headless', required=False, type=click.IntRange(min=1),
+              metavar='FRAMES',
+              help='Run FRAMES frames without a display or input, then exit.')
+@click.option('--bench', required=False, type=click.Path(exists=True),
+              metavar='MAP',
+              help='Fly through MAP headless and report frame timings.')
+@click.option('--bench_frames', default=600, show_default=True,
+              type=click.IntRange(min=1), help='Frames to benchmark.')
+@click.option('--bench_output', default='bench.json', show_default=True,
+              type=click.Path(), help='Where to write the JSON report.')
+def main(test_map, headless, bench, bench_frames, bench_output):
     title = f'{TITLE} v{VERSION}'
     print(title)
     print(__copyright__)
     if test_map:
         test_the_map(test_map)
+    elif bench:
+        from benchmarks.flythrough import print_report, run_bench
+        print_report(run_bench(bench, bench_frames, bench_output))
+    elif headless:
+        from game import run_headless
+        run_headless(headless, title)
     else:
         from game import run_doom_wolf
         run_doom_wolf(title)
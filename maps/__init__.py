@@ -33,6 +33,11 @@ class MapBuilder:
         self.the_map.floor_texture = floor
         return self
 
+    @copy_method
+    def set_ceiling_texture(self, ceiling: pg.Surface):
+        self.the_map.ceiling_texture = ceiling
+        return self
+
     @copy_method
     def set_floor_color(self, color: pg.Color):
         self.the_map.floor_color = color
@@ -58,6 +63,11 @@ class MapBuilder:
         self.the_map.enemies = enemies
         return self
 
+    @copy_method
+    def set_pathfinding(self, pathfinding: Optional[str] = None):
+        self.the_map.pathfinding = pathfinding
+        return self
+
     def build(self) -> Map:
         self.the_map.load_map()
         return self.the_map
@@ -73,18 +83,20 @@ def game_map(game, map_path: str) -> MapBuilder:
             music = map_dict.get('music', 'theme.mp3')
             sky_tex = map_dict.get('sky_texture', 'sky.png')
             floor_tex = map_dict.get('floor_texture')
+            ceiling_tex = map_dict.get('ceiling_texture')
             floor_clr = map_dict.get('floor_color',
                                      {'R': 30, 'G': 30, 'B': 30})
             mini_map = map_dict.get('minimap')
             sprite_map = map_dict.get('sprite_map')
             enemy_count = map_dict.get('enemy_count', 20)
             enemies = map_dict.get('enemies')
+            pathfinding = map_dict.get('pathfinding')
 
             builder: MapBuilder = MapBuilder(game, name) \
                 .set_mini_map(mini_map) \
-                .set_floor_texture(floor_tex) \
                 .set_enemy_count(enemy_count) \
-                .set_enemies(enemies)
+                .set_enemies(enemies) \
+                .set_pathfinding(pathfinding)
 
             music_path = os.path.join(con.MUSIC_BASE, music)
             if os.path.exists(music_path):
@@ -92,11 +104,25 @@ def game_map(game, map_path: str) -> MapBuilder:
 
             sky_tex_path = os.path.join(con.TEXTURE_BASE, sky_tex)
             if os.path.exists(sky_tex_path):
-                sky_res = (con.WIDTH, con.HALF_HEIGHT)
+                config = game.render_config
+                sky_res = (config.width, config.half_height)
                 the_sky = game.object_renderer.get_texture(sky_tex_path, sky_res)
                 if the_sky:
                     builder = builder.set_sky_texture(the_sky)
 
+            # Floor/ceiling textures replace the floor color/sky when set.
+            if floor_tex:
+                floor_tex_path = os.path.join(con.TEXTURE_BASE, floor_tex)
+                the_floor = game.object_renderer.get_texture(floor_tex_path)
+                if the_floor:
+                    builder = builder.set_floor_texture(the_floor)
+
+            if ceiling_tex:
+                ceiling_tex_path = os.path.join(con.TEXTURE_BASE, ceiling_tex)
+                the_ceiling = game.object_renderer.get_texture(ceiling_tex_path)
+                if the_ceiling:
+                    builder = builder.set_ceiling_texture(the_ceiling)
+
             if floor_clr:
                 flr_clr = pg.Color((
                     floor_clr['R'], floor_clr['G'], floor_clr['B']))
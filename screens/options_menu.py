@@ -31,6 +31,8 @@ class OptionsMenu:
                 self.settings.monitor_id = data[key][0][1]
             elif key == "resolution":
                 self.settings.resolution = data[key][0][1]
+            elif key == "render_resolution":
+                self.settings.render_resolution = data[key][0][1]
             else:
                 print(f'WARN: Unrecognized options key: {key}')
 
@@ -56,6 +58,13 @@ class OptionsMenu:
     def _get_monitor_ids() -> list[tuple[str, int]]:
         return [(str(x), x) for x in range(pg.display.get_num_displays())]
 
+    @staticmethod
+    def _get_render_resolutions() -> list[tuple[str, Resolution]]:
+        # Rendering below the window resolution trades sharpness for speed.
+        modes = [(1280, 720), (960, 540), (800, 450), (640, 360)]
+        return [('Native', Resolution.zero())] + [
+            (f'{w}x{h}', Resolution(w, h)) for w, h in modes]
+
     @staticmethod
     def _get_display_modes_for_monitor(monitor: int) -> list[tuple[str, Resolution]]:
         return [(f'{str(x[0])}x{str(x[1])}', Resolution.from_tuple(x))
@@ -248,6 +257,17 @@ class OptionsMenu:
                                                  default=default_disp_index,
                                                  items=self.display_modes,
                                                  dropselect_id='resolution')
+        render_modes = self._get_render_resolutions()
+        render_index: int = 0
+        for i, res in enumerate(render_modes):
+            if res[1] == self.settings.render_resolution:
+                render_index = i
+                break
+
+        self.menu.add.dropselect(title="Render resolution",
+                                 default=render_index,
+                                 items=render_modes,
+                                 dropselect_id='render_resolution')
         self.menu.add.toggle_switch(title="Launch full screen",
                                     default=self.settings.launch_fullscreen,
                                     toggleswitch_id="launch_fullscreen")
@@ -14,8 +14,8 @@ class PauseScreen:
 
     def __init__(self, game):
         self.game = game
-        res_w: int = game.screen.get_width()
-        res_h: int = game.screen.get_height()
+        res_w: int = game.window.get_width()
+        res_h: int = game.window.get_height()
         self.menu: pm.Menu = pm.Menu(title="Paused",
                                      width=res_w,
                                      height=res_h,
@@ -116,7 +116,7 @@ class PauseScreen:
 
     def event_loop(self):
         if self.menu.is_enabled():
-            self.menu.mainloop(self.game.screen)
+            self.menu.mainloop(self.game.window)
 
     def show_menu(self):
         if not self.created:
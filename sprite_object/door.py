@@ -1,4 +1,3 @@
-import pygame as pg
 from enum import Enum
 
 from engine import constants as con
@@ -59,24 +58,13 @@ class Door(AnimatedSprite):
                 if self.game.map.has_obstacle(my_pos):
                     self.game.map.remove_obstacle(my_pos)
 
-    def get_sprite_projection(self):
-        if not self.image:
-            return
-
-        proj_height = con.SCREEN_DIST / self.norm_dist
-        sprite_width = proj_height * self.SCALE_WIDTH
-        sprite_height = proj_height * self.SPRITE_SCALE
-
-        image = pg.transform.scale(self.image, (sprite_width, sprite_height))
-
-        self.sprite_half_width = sprite_width // 2
-        height_shift = sprite_height * self.SPRITE_HEIGHT_SHIFT
-        w = self.screen_x - self.sprite_half_width
-        h = con.HALF_HEIGHT - sprite_height // 2 + height_shift
-        pos = w, h
+    def view_radius(self) -> float:
+        return self.SCALE_WIDTH / 2
 
-        self.game.ray_caster.objects_to_render.append(
-            (self.norm_dist, image, pos))
+    def projection_size(self, norm_dist: float) -> tuple[int, int]:
+        proj_height = self.game.ray_caster.tables.projection(norm_dist)
+        return self.projected_size(proj_height * self.SCALE_WIDTH,
+                                   proj_height * self.SPRITE_SCALE)
 
     def update(self):
         if self.removed: